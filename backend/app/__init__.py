@@ -0,0 +1,4 @@
+from dotenv import load_dotenv
+
+# Load env variables once for the whole process; existing values win.
+load_dotenv(override=False)
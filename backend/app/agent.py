@@ -7,17 +7,288 @@ Modes:
 - research: Deep research with multi-agent coordination
 """
 
+import asyncio
+import logging
 import os
-from dotenv import load_dotenv
+import re
+import time
+import orjson
+from collections import OrderedDict
+from datetime import timedelta
+from functools import cache, lru_cache
+from pathlib import Path
 from langchain_openai import ChatOpenAI
-from langchain_core.runnables import ConfigurableField
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.runnables import ConfigurableField, ensure_config
+from langchain_core.runnables.configurable import RunnableConfigurableFields
+from pydantic import PrivateAttr
 from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain_mcp_adapters.tools import load_mcp_tools
-from .tools.marketing import get_autocomplete_suggestions, get_google_trends
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp.types import Tool
+from .tools.marketing import (
+    close_http_client,
+    get_autocomplete_suggestions,
+    get_google_trends,
+)
+from .tools.mcp_pool import MCPSessionPool
+
+logger = logging.getLogger(__name__)
+
+# Env variables are loaded once by the app package (see app/__init__.py)
+_getenv = os.environ.get
+_OPENAI_API_KEY = _getenv("OPENAI_API_KEY")
+_TAVILY_API_KEY = _getenv("TAVILY_API_KEY")
+# Custom endpoints (proxies, Azure, local servers) use their own key formats
+_OPENAI_BASE_URL = _getenv("OPENAI_BASE_URL")
+_OPENAI_KEY_RE = re.compile(r"^sk-(proj-)?[A-Za-z0-9_-]{20,}$")
+# Warm the model client up in the background at startup (opt-in; no completion
+# is requested, it only opens the connection and loads the tokenizer)
+WARMUP_MODEL = _getenv("DEEPAGENT_WARMUP", "").strip() == "1"
+# Exact-match cache for LLM calls and brew worker results (opt-in, handy in dev)
+LLM_CACHE = _getenv("DEEPAGENT_LLM_CACHE", "").strip() == "1"
+LLM_CACHE_SIZE = 1024
+# Cap on OpenAI requests in flight across the process, so bursts queue here instead
+# of turning into 429s and backoff retries (0 = no cap)
+LLM_CONCURRENCY = int(_getenv("DEEPAGENT_LLM_CONCURRENCY", "0") or 0)
+
+# Conversation threads idle for longer than this are evicted from the checkpointer
+THREAD_IDLE_TTL = 30 * 60
+# Persist thread history in this SQLite file, or a PostgreSQL database given as a
+# postgres:// URL, instead of memory (unset = in-memory)
+CHECKPOINT_DB = _getenv("DEEPAGENT_CHECKPOINT_DB", "").strip()
+
+# MCP tool schemas rarely change, so they are cached on disk across restarts
+MCP_TOOL_CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "mcp_tools.json"
+MCP_TOOL_CACHE_TTL = 24 * 60 * 60
+# Seconds to wait on a single MCP request (e.g. one Tavily search) before giving up
+MCP_TOOL_TIMEOUT = 30
+# Reuse identical Tavily calls (same tool and arguments) for this many seconds;
+# the same queries recur across brew tasks and sessions (0 = off)
+MCP_RESULT_CACHE_TTL = int(_getenv("DEEPAGENT_TOOL_CACHE_TTL", "0") or 0)
+
+_CHECKPOINTER = None
+# Dataclasses kept in brew graph state; checkpoints may only load registered
+# types (langgraph warns on the rest and will block them in a future version)
+_CHECKPOINT_TYPES = [
+    (f"{__package__}.brew.state", name) for name in ("TaskAssignment", "TaskPlan", "WorkerReport")
+]
+
+
+def _checkpoint_serde():
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    return JsonPlusSerializer(allowed_msgpack_modules=_CHECKPOINT_TYPES)
+
+
+def _get_checkpointer():
+    """Process-wide checkpointer shared by all managers (in-memory unless opened first)."""
+    global _CHECKPOINTER
+    if _CHECKPOINTER is None:
+        from langgraph.checkpoint.memory import MemorySaver
+
+        _CHECKPOINTER = MemorySaver(serde=_checkpoint_serde())
+    return _CHECKPOINTER
+
+
+def _is_postgres_url(target: str) -> bool:
+    return target.startswith(("postgres://", "postgresql://"))
+
+
+async def _open_checkpointer(target: str):
+    """Make a durable checkpointer on `target` (SQLite path or Postgres URL) the process-wide one."""
+    global _CHECKPOINTER
+    if _is_postgres_url(target):
+        try:
+            from psycopg import AsyncConnection
+            from psycopg.rows import dict_row
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+        except ImportError as e:
+            raise RuntimeError(
+                "A postgres:// DEEPAGENT_CHECKPOINT_DB needs langgraph-checkpoint-postgres "
+                "(pip install 'deepagent[postgres]')."
+            ) from e
+
+        # Settings the saver requires when given its own connection
+        conn = await AsyncConnection.connect(
+            target, autocommit=True, prepare_threshold=0, row_factory=dict_row
+        )
+        saver = AsyncPostgresSaver(conn, serde=_checkpoint_serde())
+    else:
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        conn = await aiosqlite.connect(target)
+        # The saver enables WAL; with WAL, NORMAL sync is durable and skips an fsync per write
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        saver = AsyncSqliteSaver(conn, serde=_checkpoint_serde())
+    await saver.setup()
+    _CHECKPOINTER = saver
+
+
+async def _close_checkpointer():
+    global _CHECKPOINTER
+    saver, _CHECKPOINTER = _CHECKPOINTER, None
+    await saver.conn.close()
+
+
+_llm_slots = asyncio.Semaphore(LLM_CONCURRENCY) if LLM_CONCURRENCY > 0 else None
+
+
+class _LimitedChatOpenAI(ChatOpenAI):
+    """ChatOpenAI whose async calls each hold a process-wide slot (see LLM_CONCURRENCY)."""
+
+    async def _agenerate(self, *args, **kwargs):
+        if self.streaming:
+            # Delegates to _astream, which takes the slot
+            return await super()._agenerate(*args, **kwargs)
+        async with _llm_slots:
+            return await super()._agenerate(*args, **kwargs)
+
+    async def _astream(self, *args, **kwargs):
+        async with _llm_slots:
+            async for chunk in super()._astream(*args, **kwargs):
+                yield chunk
+
+
+@lru_cache(maxsize=8)
+def _chat_model(model_name: str = "gpt-4.1", temperature: float = 0) -> ChatOpenAI:
+    """Shared ChatOpenAI client, so every manager reuses one HTTP connection pool."""
+    cls = _LimitedChatOpenAI if _llm_slots is not None else ChatOpenAI
+    return cls(model=model_name, temperature=temperature, api_key=_OPENAI_API_KEY)
+
+
+class _CachedConfigurableFields(RunnableConfigurableFields):
+    """
+    Configurable fields that build each distinct configuration's model once.
+
+    The stock implementation constructs (and validates) a new ChatOpenAI, with
+    new OpenAI SDK clients, on every call that carries a configurable override.
+    Every request sets model_name, so that was every model call.
+    """
+
+    # Models built per configuration, least recently used first. Read through
+    # __pydantic_private__, since DynamicRunnable forwards unknown attribute
+    # lookups to `default`.
+    _configured: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+
+    def _prepare(self, config=None):
+        config = ensure_config(config)
+        values = config.get("configurable", {})
+        key = repr([(spec.id, values.get(spec.id)) for spec in self.fields.values()])
+        cache = self.__pydantic_private__["_configured"]
+        model = cache.get(key)
+        if model is None:
+            model = cache[key] = super()._prepare(config)[0]
+            if len(cache) > _CONFIGURED_MODELS_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return model, config
+
+    def with_config(self, config=None, **kwargs):
+        bound = super().with_config(config, **kwargs)
+        # Same default and fields, so the same models
+        bound.__pydantic_private__["_configured"] = self.__pydantic_private__["_configured"]
+        return bound
+
+
+# Distinct configurations (model x reasoning settings) kept per wrapper
+_CONFIGURED_MODELS_SIZE = 32
+
+
+@cache
+def _make_configurable_model(model_name: str = "gpt-4.1", temperature: float = 0):
+    """Configurable wrapper over the shared client, built once and reused by every mode."""
+    return _CachedConfigurableFields(
+        default=_chat_model(model_name, temperature),
+        fields={
+            "model_name": ConfigurableField(id="model_name"),
+            "reasoning": ConfigurableField(id="reasoning"),
+            "output_version": ConfigurableField(id="output_version"),
+            "reasoning_effort": ConfigurableField(id="reasoning_effort"),
+        },
+    )
+
+
+def _read_tool_cache(path: Path) -> list[Tool] | None:
+    """Return the cached MCP tool definitions, or None if missing or stale."""
+    try:
+        if time.time() - path.stat().st_mtime > MCP_TOOL_CACHE_TTL:
+            return None
+        return [Tool.model_validate(t) for t in orjson.loads(path.read_bytes())]
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring MCP tool cache: {e!r}")
+        return None
+
+
+def _write_tool_cache(path: Path, tools: list[Tool]):
+    """Persist MCP tool definitions (name, description, input schema, ...)."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(
+            orjson.dumps([t.model_dump(mode="json", exclude_none=True) for t in tools])
+        )
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not write MCP tool cache: {e!r}")
+
+
+async def _list_mcp_tools(session) -> list[Tool]:
+    """Fetch every tool definition from an MCP session, following pagination."""
+    tools, cursor = [], None
+    while True:
+        page = await session.list_tools(cursor=cursor)
+        tools.extend(page.tools)
+        cursor = page.nextCursor
+        if not cursor:
+            return tools
+
+
+def _preload_graph_modules():
+    """Import the mode packages so their dependency trees land in sys.modules."""
+    from . import brew, research, search  # noqa: F401
+
+
+# Registry of mode name -> graph builder(model, tools, checkpointer)
+_MODE_BUILDERS = {}
+
+
+def register_mode(name: str):
+    """Register a graph builder for an agent mode."""
+
+    def decorator(builder):
+        _MODE_BUILDERS[name] = builder
+        return builder
+
+    return decorator
+
+
+@register_mode("brew")
+def _build_brew_mode(model, tools, checkpointer):
+    """Brew Mode - Multi-agent orchestration."""
+    from .brew import create_brew_graph
 
-# Load env variables
-load_dotenv()
+    # Full brew graph (orchestrator-worker pattern)
+    # Uses master agent to delegate to specialized workers
+    return create_brew_graph(model=model, tools=tools, checkpointer=checkpointer)
+
+
+@register_mode("search")
+def _build_search_mode(model, tools, checkpointer):
+    """Search Mode - Fast, single-agent search."""
+    from .search import create_search_graph
+
+    return create_search_graph(model=model, tools=tools, checkpointer=checkpointer)
+
+
+@register_mode("research")
+def _build_research_mode(model, tools, checkpointer):
+    """Research Mode - Deep research with subagents."""
+    from .research import create_research_graph
+
+    return create_research_graph(model=model, tools=tools, checkpointer=checkpointer)
 
 
 class AgentManager:
@@ -27,59 +298,136 @@ class AgentManager:
     Attributes:
         agents: Dictionary of compiled graphs by mode name
         tools: List of available tools (Tavily)
-        checkpointer: Memory checkpointer for conversation history
+        checkpointer: Checkpointer for conversation history (memory, SQLite or PostgreSQL)
     """
 
     def __init__(self):
         self.client = None
-        self.session_context = None
-        self.session = None
+        self.pool = None
         self.agents = {}
-        self.checkpointer = MemorySaver()
+        self._agent_dispatch = {}
+        self._build_locks = {}
+        self._connect_lock = asyncio.Lock()
+        self._thread_last_seen = {}
+        self._thread_runs = {}  # thread id -> runs in progress (never evicted)
+        self._eviction_task = None
+        self._warmup_task = None
         self.tools = []
         self.model = None
 
+    @property
+    def checkpointer(self):
+        """Checkpointer shared across managers."""
+        return _get_checkpointer()
+
     async def initialize(self):
         """Initialize all agents and tools."""
-        # === Load Tools ===
-        await self._initialize_tools()
-
         # === Configure Model ===
+        # Cheap and may raise on a bad key, so it runs before anything is opened
         self._configure_model()
+        if LLM_CACHE:
+            set_llm_cache(InMemoryCache(maxsize=LLM_CACHE_SIZE))
 
-        # === Initialize All Modes ===
-        self._initialize_brew_mode()
-        self._initialize_search_mode()
-        self._initialize_research_mode()
-
-        print("Agents initialized successfully for all modes (brew, search, research).")
+        # === Load Tools ===
+        # The MCP connection dominates startup, so import the (heavy) mode
+        # packages and open the checkpointer while it is being established.
+        tools_task = asyncio.create_task(self.connect())
+        preload_task = asyncio.create_task(asyncio.to_thread(_preload_graph_modules))
+        if WARMUP_MODEL:
+            # Not awaited: overlaps with the MCP connection and later startup work
+            self._warmup_task = asyncio.create_task(self._warmup_model())
+        try:
+            if CHECKPOINT_DB and _CHECKPOINTER is None:
+                await _open_checkpointer(CHECKPOINT_DB)
+                # Postgres URLs may carry credentials
+                where = "PostgreSQL" if _is_postgres_url(CHECKPOINT_DB) else CHECKPOINT_DB
+                logger.info(f"Persisting threads to {where}")
+            await asyncio.gather(tools_task, preload_task)
+        except BaseException:
+            # Don't leave startup work running (or the MCP pool half open)
+            pending = [tools_task, preload_task]
+            if self._warmup_task:
+                pending.append(self._warmup_task)
+                self._warmup_task = None
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await self.disconnect()
+            raise
+
+        # Modes are built lazily on first use (see get_agent), so startup
+        # only pays for the model and the tools.
+        if not CHECKPOINT_DB:
+            # Persisted threads are kept; only the in-memory store needs bounding
+            self._eviction_task = asyncio.create_task(self._evict_idle_threads())
+
+        logger.info(f"Agents ready for all modes ({', '.join(_MODE_BUILDERS)}).")
+
+    async def connect(self):
+        """Open the MCP session pool and load tools (no-op if already connected)."""
+        async with self._connect_lock:
+            if self.pool is None:
+                await self._initialize_tools()
+
+    async def disconnect(self):
+        """Close the MCP session pool and drop the graphs bound to its tools."""
+        async with self._connect_lock:
+            if self.pool is None:
+                return
+            pool, self.pool = self.pool, None
+            self.client = None
+            self.tools = []
+            self.agents.clear()
+            self._agent_dispatch.clear()
+            await pool.close()
+            logger.debug("MCP sessions closed.")
 
     async def _initialize_tools(self):
         """Initialize Tavily MCP tools."""
-        tavily_api_key = os.getenv("TAVILY_API_KEY")
+        tavily_api_key = _TAVILY_API_KEY
         if not tavily_api_key:
             raise ValueError("TAVILY_API_KEY not found in environment.")
 
         mcp_url = f"https://mcp.tavily.com/mcp?tavilyApiKey={tavily_api_key}"
-        print("Connecting to Tavily MCP via 'npx mcp-remote' bridge...")
+        logger.debug("Connecting to Tavily MCP over streamable HTTP...")
 
+        # Talk to the remote server directly instead of through a local
+        # `npx mcp-remote` stdio bridge (saves a subprocess and a hop per call).
         self.client = MultiServerMCPClient(
             {
                 "tavily": {
-                    "command": "npx",
-                    "args": ["-y", "mcp-remote", mcp_url],
-                    "transport": "stdio",
+                    "url": mcp_url,
+                    "transport": "streamable_http",
+                    "timeout": MCP_TOOL_TIMEOUT,
+                    "session_kwargs": {
+                        "read_timeout_seconds": timedelta(seconds=MCP_TOOL_TIMEOUT)
+                    },
                 }
             }
         )
 
-        self.session_context = self.client.session("tavily")
-        self.session = await self.session_context.__aenter__()
+        # Keep several persistent sessions so concurrent graphs don't
+        # serialize their tool calls through a single connection.
+        self.pool = MCPSessionPool(
+            self.client, "tavily", result_ttl=MCP_RESULT_CACHE_TTL
+        )
+        await self.pool.start()
 
-        print("Session established. Loading tools...")
-        print("Session established. Loading tools...")
-        mcp_tools = await load_mcp_tools(self.session)
-        print(
+        logger.debug(
+            f"Session pool established ({self.pool.size} sessions). Loading tools..."
+        )
+        # Skip the schema round-trip on warm starts
+        definitions = await asyncio.to_thread(_read_tool_cache, MCP_TOOL_CACHE_PATH)
+        if definitions is None:
+            definitions = await _list_mcp_tools(self.pool)
+            await asyncio.to_thread(_write_tool_cache, MCP_TOOL_CACHE_PATH, definitions)
+
+        # Tools borrow a pooled session per call
+        mcp_tools = [
+            convert_mcp_tool_to_langchain_tool(self.pool, tool)
+            for tool in definitions
+        ]
+        logger.info(
             f"Loaded {len(mcp_tools)} tools from Tavily: {[t.name for t in mcp_tools]}"
         )
         # Combine MCP tools with local tools
@@ -87,57 +435,35 @@ class AgentManager:
 
     def _configure_model(self):
         """Configure the base model with dynamic overrides."""
-        self.model = ChatOpenAI(model="gpt-4.1", temperature=0).configurable_fields(
-            model_name=ConfigurableField(id="model_name"),
-            reasoning=ConfigurableField(id="reasoning"),
-            output_version=ConfigurableField(id="output_version"),
-            reasoning_effort=ConfigurableField(id="reasoning_effort"),
-        )
-
-    def _initialize_brew_mode(self):
-        """Initialize Brew Mode - Multi-agent orchestration."""
-        from .brew import create_brew_graph
-
-        # Full brew graph (orchestrator-worker pattern)
-        # Uses master agent to delegate to specialized workers
-        brew_graph = create_brew_graph(
-            model=self.model,
-            tools=self.tools,
-            checkpointer=self.checkpointer,
-        )
-        self.agents["brew"] = brew_graph
-
-        print("  [OK] Brew mode initialized (multi-agent orchestration)")
-
-    def _initialize_search_mode(self):
-        """Initialize Search Mode - Fast, single-agent search."""
-        from .search import create_search_graph
-
-        search_graph = create_search_graph(
-            model=self.model,
-            tools=self.tools,
-            checkpointer=self.checkpointer,
-        )
-        self.agents["search"] = search_graph
-
-        print("  [OK] Search mode initialized")
-
-    def _initialize_research_mode(self):
-        """Initialize Research Mode - Deep research with subagents."""
-        from .research import create_research_graph
-
-        research_graph = create_research_graph(
-            model=self.model,
-            tools=self.tools,
-            checkpointer=self.checkpointer,
-        )
-        self.agents["research"] = research_graph
-
-        print("  [OK] Research mode initialized")
-
-    def get_agent(self, mode: str = None):
+        # Fail fast instead of paying an authenticated round-trip for a 401
+        if not _OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not found in environment.")
+        if not _OPENAI_BASE_URL and not _OPENAI_KEY_RE.match(_OPENAI_API_KEY):
+            raise ValueError("OPENAI_API_KEY is malformed (expected 'sk-...').")
+
+        self.model = _make_configurable_model("gpt-4.1", 0)
+
+    async def _warmup_model(self):
+        """Pay the model's first-call costs (TLS, tokenizer) up front, without a completion."""
+        try:
+            import tiktoken
+
+            try:
+                await asyncio.to_thread(tiktoken.encoding_for_model, "gpt-4.1")
+            except KeyError:
+                await asyncio.to_thread(tiktoken.get_encoding, "o200k_base")
+
+            # Listing models is free, unlike a completion, and opens the pooled
+            # TLS connection every model call reuses
+            async with asyncio.timeout(2):
+                await self.model.default.root_async_client.models.list()
+            logger.debug("Model warmed up.")
+        except Exception as e:
+            logger.warning(f"Model warmup skipped: {e!r}")
+
+    async def get_agent(self, mode: str = None):
         """
-        Get the agent for the specified mode.
+        Get the agent for the specified mode, building it on first use.
 
         Args:
             mode: The mode to use. Options:
@@ -151,31 +477,111 @@ class AgentManager:
         Raises:
             RuntimeError: If agents not initialized
         """
-        # Default to brew mode if mode is None or empty
-        if not mode:
-            mode = "brew"
+        agent = self._agent_dispatch.get(mode)
+        if agent is not None:
+            return agent
+        return await self._resolve_agent(mode)
+
+    async def _resolve_agent(self, mode: str = None):
+        """Slow path for get_agent: normalize the mode name and memoize it."""
+        if self.model is None:
+            raise RuntimeError("Agent not initialized. Call initialize() first.")
+        # Reopen the pool after a disconnect() (and wait out one in progress),
+        # so modes are never built without their MCP tools
+        await self.connect()
 
-        # Normalize mode name
-        mode = mode.lower().strip()
+        key = (mode or "brew").lower().strip()
 
-        if mode not in self.agents:
+        if key not in _MODE_BUILDERS:
             # Fallback to brew if mode not found
-            if "brew" in self.agents:
-                print(f"Mode '{mode}' not found, falling back to 'brew'")
-                return self.agents["brew"]
-            raise RuntimeError("Agent not initialized. Call initialize() first.")
-
-        return self.agents[mode]
+            logger.warning(f"Mode '{key}' not found, falling back to 'brew'")
+            return await self._build_mode("brew")
+
+        agent = await self._build_mode(key)
+        # Only valid aliases are memoized so arbitrary input can't grow the table
+        self._agent_dispatch[mode] = agent
+        return agent
+
+    async def _build_mode(self, name: str):
+        """Build and cache the graph for a mode (at most once, even under concurrency)."""
+        agent = self.agents.get(name)
+        if agent is not None:
+            return agent
+
+        async with self._build_locks.setdefault(name, asyncio.Lock()):
+            agent = self.agents.get(name)
+            if agent is None:
+                # Graph builders are synchronous, so run them in a worker thread
+                agent = await asyncio.to_thread(
+                    _MODE_BUILDERS[name], self.model, self.tools, self.checkpointer
+                )
+                self.agents[name] = agent
+                self._agent_dispatch[name] = agent
+                if name == "brew":
+                    # Default to brew mode if mode is None or empty
+                    self._agent_dispatch[None] = agent
+                    self._agent_dispatch[""] = agent
+                logger.debug(f"{name.capitalize()} mode initialized")
+        return agent
+
+    def touch_thread(self, thread_id: str):
+        """Record activity on a conversation thread (keeps it from being evicted)."""
+        if CHECKPOINT_DB:
+            return
+        self._thread_last_seen[thread_id] = time.monotonic()
+
+    def begin_thread_run(self, thread_id: str):
+        """Mark a run on the thread as started; it is not evicted until the run ends."""
+        if CHECKPOINT_DB:
+            return
+        self._thread_runs[thread_id] = self._thread_runs.get(thread_id, 0) + 1
+        self.touch_thread(thread_id)
+
+    def end_thread_run(self, thread_id: str):
+        """Mark a run as finished; the idle timeout counts from now."""
+        if CHECKPOINT_DB:
+            return
+        runs = self._thread_runs.pop(thread_id, 0) - 1
+        if runs > 0:
+            self._thread_runs[thread_id] = runs
+        self.touch_thread(thread_id)
+
+    async def _evict_idle_threads(self):
+        """Drop checkpoints of threads idle for longer than THREAD_IDLE_TTL."""
+        while True:
+            await asyncio.sleep(60)
+            self._evict_idle()
+
+    def _evict_idle(self) -> list[str]:
+        cutoff = time.monotonic() - THREAD_IDLE_TTL
+        idle = [
+            t
+            for t, seen in self._thread_last_seen.items()
+            if seen < cutoff and t not in self._thread_runs
+        ]
+        for thread_id in idle:
+            del self._thread_last_seen[thread_id]
+            self.checkpointer.delete_thread(thread_id)
+        if idle:
+            logger.info(f"Evicted {len(idle)} idle thread(s) from the checkpointer.")
+        return idle
 
     def list_modes(self) -> list:
         """List all available modes."""
-        return list(self.agents.keys())
+        return list(_MODE_BUILDERS)
 
     async def cleanup(self):
         """Cleanup resources."""
-        if self.session_context:
-            await self.session_context.__aexit__(None, None, None)
-            print("MCP session closed.")
+        if self._warmup_task:
+            self._warmup_task.cancel()
+            self._warmup_task = None
+        if self._eviction_task:
+            self._eviction_task.cancel()
+            self._eviction_task = None
+        await self.disconnect()
+        await close_http_client()
+        if CHECKPOINT_DB and _CHECKPOINTER is not None:
+            await _close_checkpointer()
 
 
 # Global agent manager instance
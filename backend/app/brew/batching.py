@@ -0,0 +1,88 @@
+"""
+Micro-batching for planner calls.
+
+When several brew requests arrive at once, each planner call is a separate
+OpenAI round-trip. BatchedPlanner collects calls made within a short window
+and issues them as one `abatch`, resolving each caller's future with its
+own result. Every item keeps its caller's config (model overrides, callbacks).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+# Batching window in milliseconds; 0 disables batching (the default)
+PLANNER_BATCH_MS = int(os.getenv("BREW_PLANNER_BATCH_MS", "0") or 0)
+
+
+class BatchedPlanner:
+    """
+    Coalesce concurrent `ainvoke` calls on a runnable into `abatch` calls.
+
+    Attributes:
+        runnable: The runnable to batch (e.g. the tool-bound planner model)
+        window: Seconds to wait for more calls before flushing a batch
+        max_batch: Flush immediately once this many calls are pending
+        max_concurrency: Upper bound on concurrent requests within a batch
+    """
+
+    def __init__(
+        self,
+        runnable: Runnable,
+        window_ms: int = 20,
+        max_batch: int = 16,
+        max_concurrency: int = 8,
+    ):
+        self.runnable = runnable
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+        self._pending: list[tuple[object, RunnableConfig | None, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        # The loop only holds weak references to tasks; keep running batches alive
+        self._running: set[asyncio.Task] = set()
+
+    async def submit(self, input, config: RunnableConfig | None = None):
+        """Queue one call and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((input, config, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        inputs = [item for item, _, _ in batch]
+        configs = [
+            {**(config or {}), "max_concurrency": self.max_concurrency}
+            for _, config, _ in batch
+        ]
+        try:
+            results = await self.runnable.abatch(
+                inputs, config=configs, return_exceptions=True
+            )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,243 @@
+"""Shared brew helpers: planner routing heuristics, message and report handling."""
+
+from __future__ import annotations
+
+import io
+import re
+from functools import lru_cache
+from itertools import islice, product
+from typing import Iterable, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from langchain_core.messages import HumanMessage
+
+from .state import TaskAssignment, WorkerReport
+
+
+# --- Planner routing heuristics (compiled once at import) ---
+_GREETINGS = frozenset(
+    {
+        "hi",
+        "hello",
+        "hey",
+        "yo",
+        "sup",
+        "howdy",
+        "kiddan",
+        "kiddaan",
+        "tussin",
+        "tusin",
+    }
+)
+_ACTION_KEYWORDS = (
+    "research",
+    "search",
+    "find",
+    "latest",
+    "sources",
+    "cite",
+    "tavily",
+    "news",
+    "trend",
+    "twitter",
+    "tweet",
+    "linkedin",
+    "post",
+    "campaign",
+    "strategy",
+    "analyze",
+    "analysis",
+    "benchmark",
+    "kpi",
+    "metrics",
+)
+# Keywords match at the start of a word ("trend" -> "trending"); "x" only as a whole word
+_ACTION_RE = re.compile(r"\b(?:x\b|(?:%s))" % "|".join(_ACTION_KEYWORDS))
+_SMALL_TALK_RE = re.compile(r"who are you|what can you do|how are you")
+# Bare acknowledgements need a short reply, not a worker run
+_ACK_RE = re.compile(
+    r"(?:ok(?:ay)?|k|yes|yep|sure|cool|great|nice|perfect|thanks?(?: you)?|thx|ty"
+    r"|looks? good|sounds good|got it|lgtm|proceed|go ahead|👍|✅|🙏)[\s.!]*",
+    re.I,
+)
+# Longest message still checked against _ACK_RE (the longest acknowledgement plus slack)
+_ACK_MAX_CHARS = 32
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _decide_route(is_action: bool, is_greeting: bool, is_small_talk: bool, size: int) -> str:
+    """
+    Heuristic routing (size: 0 = <=6 tokens, 1 = <=25 tokens, 2 = longer):
+    - casual greetings / short chat -> direct response (no workers)
+    - general questions (no web needed) -> general worker (no Tavily)
+    - otherwise: structured plan
+    """
+    if size == 0 and (is_greeting or (is_small_talk and not is_action)):
+        return "direct"
+    if not is_action and size <= 1:
+        return "general"
+    return "plan"
+
+
+# Every combination of the routing signals, resolved once at import
+_ROUTE_TABLE = {
+    key: _decide_route(*key)
+    for key in product((False, True), (False, True), (False, True), (0, 1, 2))
+}
+
+
+# Only short messages (greetings, quick questions) repeat often enough to memoize;
+# caching longer ones would hash every prompt and keep them alive in memory
+_ROUTE_CACHE_MAX_CHARS = 64
+
+
+def classify_request(user_text: str) -> str:
+    """Route a user message to "direct", "general" or "plan"."""
+    if len(user_text) <= _ROUTE_CACHE_MAX_CHARS:
+        return _classify_short(user_text)
+    return _classify(user_text)
+
+
+@lru_cache(maxsize=1024)
+def _classify_short(user_text: str) -> str:
+    return _classify(user_text)
+
+
+def _classify(user_text: str) -> str:
+    # Bare acknowledgements need no worker; only short messages can be one
+    if len(user_text) <= _ACK_MAX_CHARS and _ACK_RE.fullmatch(user_text.strip()):
+        return "direct"
+    # Only the first 26 tokens matter (anything longer is always planned), so
+    # long prompts are neither lowercased nor fully tokenized.
+    tokens = [m.group().lower() for m in islice(_TOKEN_RE.finditer(user_text), 26)]
+    # Empty or whitespace-only turns need no worker either (with no tokens the
+    # scan above already covered the whole text)
+    if not tokens and (not user_text or user_text.isspace()):
+        return "direct"
+    if len(tokens) > 25:
+        return "plan"
+    size = 0 if len(tokens) <= 6 else 1
+    user_lower = user_text.lower()
+    return _ROUTE_TABLE[
+        (
+            _ACTION_RE.search(user_lower) is not None,
+            size == 0 and not _GREETINGS.isdisjoint(tokens),
+            size == 0 and _SMALL_TALK_RE.search(user_lower) is not None,
+            size,
+        )
+    ]
+
+
+def last_user_text(messages: list) -> str:
+    """Text of the most recent user message (LangChain message or role/content dict)."""
+    for msg in reversed(messages):
+        if isinstance(msg, dict):
+            if msg.get("role", "user") == "user":
+                return str(msg.get("content", ""))
+        elif isinstance(msg, HumanMessage):
+            return msg.content if isinstance(msg.content, str) else str(msg.content)
+    return ""
+
+
+def format_reports(reports: List[WorkerReport]) -> str:
+    """Render worker reports for the synthesizer, writing pieces straight into one buffer."""
+    buf = io.StringIO()
+    write = buf.write
+    for i, r in enumerate(reports):
+        if i:
+            write("\n\n")
+        write("## ")
+        write(r.worker)
+        write(" (")
+        write(r.status)
+        write(")\nTask: ")
+        write(r.task)
+        write("\n\n")
+        write(r.result)
+    return buf.getvalue()
+
+
+def format_context(reports: Iterable[WorkerReport], max_chars: int) -> str:
+    """
+    Render dependency reports for a downstream task, stopping at max_chars.
+
+    Paragraphs already given by an earlier report (reviewers and strategists
+    often restate research findings) are dropped, so the budget goes to new
+    material instead of repeated tokens.
+    """
+    parts = []
+    used = 0
+    seen = set()
+    for r in reports:
+        paragraphs = []
+        for para in r.result.split("\n\n"):
+            key = " ".join(para.split()).lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            paragraphs.append(para)
+        if not paragraphs:
+            continue
+        header = f"## {r.worker}\n"
+        if parts:
+            header = "\n\n" + header
+        room = max_chars - used - len(header)
+        if room <= 0:
+            break
+        # Stop joining once the budget is spent, so an oversized report is never copied whole
+        body = []
+        size = 0
+        for para in paragraphs:
+            if size >= room:
+                break
+            body.append(para)
+            size += len(para) + 2
+        body = "\n\n".join(body)[:room]
+        parts.append(header)
+        parts.append(body)
+        used += len(header) + len(body)
+    return "".join(parts)
+
+
+# URLs in worker output; trailing punctuation from prose/markdown is trimmed after
+_URL_RE = re.compile(r"https?://[^\s<>()\[\]\"'`]+")
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"})
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a source URL: lowercase host, no tracking params or fragment."""
+    parts = urlsplit(url.rstrip(".,;:!?*_"))
+    query = parts.query
+    if query:
+        query = urlencode(
+            [
+                (k, v)
+                for k, v in parse_qsl(query, keep_blank_values=True)
+                if not k.startswith("utm_") and k not in _TRACKING_PARAMS
+            ]
+        )
+    return urlunsplit(
+        (parts.scheme, parts.netloc.lower(), parts.path.rstrip("/") or "/", query, "")
+    )
+
+
+def extract_sources(text: str) -> list[str]:
+    """Distinct normalized URLs cited in a worker's output, in order of appearance."""
+    return list(dict.fromkeys(normalize_url(u) for u in _URL_RE.findall(text)))
+
+
+def dedupe_sources(reports: Iterable[WorkerReport]) -> list[str]:
+    """Every report's sources once, in first-seen order."""
+    return list(dict.fromkeys(s for r in reports for s in r.sources))
+
+
+def link_tasks(tasks: List[TaskAssignment]) -> List[TaskAssignment]:
+    """Give every task a unique id and drop dependencies on unknown tasks."""
+    seen = set()
+    for i, t in enumerate(tasks, start=1):
+        if not t.id or t.id in seen:
+            t.id = f"t{i}"
+        seen.add(t.id)
+    for t in tasks:
+        t.depends_on = [d for d in t.depends_on if d in seen and d != t.id]
+    return tasks
@@ -1,16 +1,48 @@
 from __future__ import annotations
 
-from typing import List
-
+import asyncio
+import datetime
+import hashlib
+import inspect
+import os
+import re
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Final, List
+
+from langchain_core.globals import get_llm_cache
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable
 from langchain_core.tools import BaseTool
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.config import get_config
 from langgraph.graph import END, START, StateGraph
-from langgraph.types import Send
-
+from langgraph.types import Command, Send
+
+from .batching import PLANNER_BATCH_MS, BatchedPlanner
+from .common import (
+    classify_request,
+    dedupe_sources,
+    extract_sources,
+    format_context,
+    format_reports,
+    last_user_text,
+    link_tasks,
+)
 from .prompts import MASTER_PLANNER_SYSTEM, MASTER_SYNTH_SYSTEM
-from .state import BrewState, TaskPlan, WorkerReport, WorkerState
+from .state import (
+    BrewState,
+    TaskAssignment,
+    TaskPlan,
+    TaskPlanSchema,
+    WORKER_NAMES,
+    WorkerReport,
+    WorkerState,
+)
 from .workers import (
     create_analytics_worker_agent,
     create_content_worker_agent,
@@ -23,352 +55,624 @@ from .workers import (
 )
 
 
-def create_brew_graph(
-    model: BaseChatModel,
-    tools: List[BaseTool],
-    checkpointer: MemorySaver | None = None,
-):
-    """
-    Brew mode: tool-less master supervisor + sequential Deep Agents workers.
+# The planner emits its plan through one forced function call; the arguments
+# arrive already JSON-decoded and are mapped straight onto dataclasses.
+PLAN_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "emit_plan",
+        "description": "Emit the task plan for the user's request.",
+        "parameters": TaskPlanSchema.model_json_schema(),
+    },
+}
+
+# The master's system prompts never change, so their messages are built once
+_PLANNER_SYSTEM_MSG = SystemMessage(content=MASTER_PLANNER_SYSTEM)
+_SYNTH_SYSTEM_MSG = SystemMessage(content=MASTER_SYNTH_SYSTEM)
+
+
+def _sdk_accepts_prompt_cache_key() -> bool:
+    """Whether the installed openai SDK takes prompt_cache_key (older ones raise TypeError)."""
+    try:
+        from openai.resources.chat.completions import AsyncCompletions
+        from openai.resources.responses import AsyncResponses
+    except ImportError:
+        return False
+    return all(
+        "prompt_cache_key" in inspect.signature(create).parameters
+        for create in (AsyncCompletions.create, AsyncResponses.create)
+    )
 
-    - planner: tool-less master, structured plan
-    - workers: deepagents workers with tools (Tavily MCP), executed sequentially by priority
-    - synthesizer: tool-less master, streams final response
-    """
 
-    # --- Create worker agents (tools ONLY here) ---
-    research_agent = create_research_worker_agent(model, tools)
-    content_agent = create_content_worker_agent(model, tools)
-    analytics_agent = create_analytics_worker_agent(model, tools)
-    social_agent = create_social_worker_agent(model, tools)
-    report_agent = create_report_worker_agent(model)
-    reviewer_agent = create_reviewer_agent(model)
-    strategist_agent = create_strategist_agent(model)
-    general_agent = create_general_worker_agent(model)
-
-    # --- Nodes ---
-    async def planner(state: BrewState) -> dict:
-        # Extract last user message
-        user_text = ""
-        for msg in reversed(state.get("messages", [])):
-            if hasattr(msg, "content"):
-                user_text = (
-                    msg.content if isinstance(msg.content, str) else str(msg.content)
-                )
-                break
-            if isinstance(msg, dict) and "content" in msg:
-                user_text = str(msg["content"])
-                break
-
-        # Heuristic routing:
-        # - casual greetings / short chat -> direct response (no workers)
-        # - general questions (no web needed) -> general worker (no Tavily)
-        # - otherwise: structured plan
-        user_lower = user_text.lower().strip()
-        tokens = [
-            t for t in user_lower.replace("?", " ").replace("!", " ").split() if t
-        ]
-        simple_greetings = {
-            "hi",
-            "hello",
-            "hey",
-            "yo",
-            "sup",
-            "howdy",
-            "kiddan",
-            "kiddaan",
-            "tussin",
-            "tusin",
-        }
-        action_keywords = [
-            "research",
-            "search",
-            "find",
-            "latest",
-            "sources",
-            "cite",
-            "tavily",
-            "news",
-            "trend",
-            "twitter",
-            "tweet",
-            "x",
-            "linkedin",
-            "post",
-            "campaign",
-            "strategy",
-            "analyze",
-            "analysis",
-            "benchmark",
-            "kpi",
-            "metrics",
-        ]
-        is_action = any(k in user_lower for k in action_keywords)
-        is_greeting_like = (len(tokens) <= 6) and any(
-            t in simple_greetings for t in tokens
-        )
-        simple = is_greeting_like or (
-            len(tokens) <= 6
-            and not is_action
-            and any(
-                k in user_lower
-                for k in ["who are you", "what can you do", "how are you"]
-            )
-        )
-        if simple:
-            return {
-                "status": "Direct response",
-                "task_plan": TaskPlan(reasoning="Direct response", tasks=[]),
-            }
+# Route each master prompt to a stable OpenAI prompt-cache key, so its static
+# prefix lands on a warm cache. Custom OpenAI-compatible endpoints may reject
+# the extra parameter, so it is only sent to OpenAI itself.
+_PROMPT_CACHE_KEYS = not os.getenv("OPENAI_BASE_URL") and _sdk_accepts_prompt_cache_key()
+_PLANNER_CALL_KWARGS = {"prompt_cache_key": "brew-planner"} if _PROMPT_CACHE_KEYS else {}
+_SYNTH_CALL_KWARGS = {"prompt_cache_key": "brew-synth"} if _PROMPT_CACHE_KEYS else {}
 
-        # Use general worker for non-web, non-marketing small questions
-        if not is_action and len(tokens) <= 25:
-            return {
-                "task_plan": TaskPlan(
-                    reasoning="General question - no internet needed",
-                    tasks=[
-                        {
-                            "worker": "general",
-                            "task": user_text,
-                            "priority": 1,
-                        }
-                    ],
-                ),
-                "status": "Planning complete: 1 tasks assigned",
-            }
+# Single-report turns from these workers skip the synthesizer's LLM call
+_PASSTHROUGH_WORKERS = frozenset({"general", "research"})
+_PASSTHROUGH_MAX_CHARS = 4096
 
-        planner_model = model.with_structured_output(TaskPlan)
-        plan: TaskPlan = await planner_model.ainvoke(
-            [
-                SystemMessage(content=MASTER_PLANNER_SYSTEM),
-                HumanMessage(content=f"Create a concise task plan for: {user_text}"),
-            ]
-        )
-        # Sort tasks by priority (1 highest) to ensure deterministic sequential execution
-        if getattr(plan, "tasks", None):
-            sorted_tasks = sorted(
-                plan.tasks, key=lambda t: getattr(t, "priority", 2) or 2
-            )
-            plan = TaskPlan(reasoning=plan.reasoning, tasks=sorted_tasks)
-        return {
-            "task_plan": plan,
-            "status": f"Planning complete: {len(plan.tasks)} tasks assigned",
-            "next_task_index": 0,
-        }
+# Results of earlier tasks handed to a dependent task are capped at this size
+_CONTEXT_MAX_CHARS = 12000
+
+# Reports from earlier turns the synthesizer still sees (most recent first), so
+# its prompt stops growing with the length of the conversation
+_SYNTH_HISTORY_REPORTS = 8
+
+# Start the next research round while the reviewer is still critiquing (opt-in)
+SPECULATIVE_DEBATE = os.getenv("BREW_SPECULATIVE_DEBATE", "").strip() == "1"
+MAX_DEBATE_ROUNDS = 3
+# The reviewer's rejection checklist, which the speculative research round targets
+_ANTICIPATED_CRITIQUE = (
+    "Fewer than 10 distinct sources, missing Keywords Table, missing Competitor Ad Copy, "
+    "or missing specific data (numbers, dates, regulations)."
+)
+# A fix item in the reviewer's critique that falls under the anticipated checklist
+_ANTICIPATED_ITEM_RE = re.compile(
+    r"source|citation|keyword|ad copy|competitor|data|number|figure|statistic|date|regulation",
+    re.I,
+)
+_CRITIQUE_ITEM_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*(.+)$", re.M)
+
+# Upper bound on one worker run, so a hung tool call or model can't stall the graph.
+# Research runs many searches and extractions, so it gets a longer budget.
+WORKER_TIMEOUT = float(os.getenv("BREW_WORKER_TIMEOUT", "300") or 300)
+RESEARCH_WORKER_TIMEOUT = float(os.getenv("BREW_RESEARCH_TIMEOUT", "900") or 900)
+_WORKER_TIMEOUTS: Final[dict[str, float]] = {"research": RESEARCH_WORKER_TIMEOUT}
+# After this many consecutive timeouts in a thread, a worker is skipped there for
+# WORKER_TRIP_COOLDOWN seconds; then one trial run decides whether it comes back
+WORKER_TIMEOUT_TRIPS = 3
+WORKER_TRIP_COOLDOWN = 300
+# Threads tracked by the circuit breaker (oldest forgotten first)
+_BREAKER_ENTRIES = 1024
+
+# Cap on deep-agent runs in flight across all brew graphs; 0 (the default) = no cap
+WORKER_CONCURRENCY = int(os.getenv("BREW_WORKER_CONCURRENCY", "0") or 0)
+_worker_slots = asyncio.Semaphore(WORKER_CONCURRENCY) if WORKER_CONCURRENCY > 0 else None
 
-    def task_router(state: BrewState) -> dict:
-        """Route to the next worker sequentially based on task priority order."""
-        plan = state.get("task_plan")
-        idx = state.get("next_task_index", 0)
-        if not plan or not getattr(plan, "tasks", None):
-            return {"route": "synthesizer"}
+# Exact-match cache of worker results, active whenever an LLM cache is configured
+# (see DEEPAGENT_LLM_CACHE in agent.py). Keyed by worker + tool set + task text.
+_WORKER_CACHE_SIZE = 256
+_worker_cache: OrderedDict[str, str] = OrderedDict()
 
-        tasks = plan.tasks
-        # Clamp index in case of drift
-        if idx >= len(tasks):
-            return {"route": "synthesizer"}
 
-        assignment = tasks[idx]
+def _worker_cache_key(worker_name: str, tools_key: str, task_text: str) -> str:
+    return hashlib.sha256(f"{worker_name}|{tools_key}|{task_text}".encode()).hexdigest()
+
+
+# Graph node for each worker
+_WORKER_NODE: Final[dict[str, str]] = {w: f"{w}_worker" for w in WORKER_NAMES}
+
+
+# Debate Loop Logic
+def critique_anticipated(critique: str) -> bool:
+    """
+    Whether every fix the reviewer asks for is on the anticipated checklist, so the
+    speculative research round already covers it. A critique without a readable
+    list of fixes never counts as anticipated.
+    """
+    items = _CRITIQUE_ITEM_RE.findall(critique)
+    return bool(items) and all(_ANTICIPATED_ITEM_RE.search(item) for item in items)
+
+
+def should_continue_debate(state: BrewState) -> str:
+    feedback = state.get("critique_feedback", "")
+    iterations = state.get("iteration_count", 0)
+
+    if "REJECT" in feedback and iterations < MAX_DEBATE_ROUNDS:
+        return "research_worker"
+    return "strategist_worker"
+
+
+@dataclass(slots=True)
+class _BrewContext:
+    """Per-graph objects the module-level nodes need, bound via functools.partial."""
+
+    model: BaseChatModel
+    planner_model: Runnable
+    batched_planner: BatchedPlanner | None
+    tools_key: str
+    agents: dict[str, Any]
+    # (thread id, worker) -> (consecutive timeouts, time of the last one or of the
+    # last trial run); the circuit breaker state, kept per conversation thread
+    timeouts: dict[tuple[str, str], tuple[int, float]] = field(default_factory=dict)
+
+
+def _breaker_key(worker_name: str) -> tuple[str, str]:
+    try:
+        thread_id = get_config().get("configurable", {}).get("thread_id")
+    except RuntimeError:  # called outside a graph run
+        thread_id = None
+    return (str(thread_id or ""), worker_name)
+
+
+def _breaker_open(ctx: _BrewContext, key: tuple[str, str]) -> bool:
+    """Whether the worker is tripped for this thread. After the cooldown one call
+    is let through as a trial (half-open), and the cooldown restarts for the rest."""
+    entry = ctx.timeouts.get(key)
+    if entry is None or entry[0] < WORKER_TIMEOUT_TRIPS:
+        return False
+    now = time.monotonic()
+    if now - entry[1] < WORKER_TRIP_COOLDOWN:
+        return True
+    ctx.timeouts[key] = (entry[0], now)
+    return False
+
+
+def _record_timeout(ctx: _BrewContext, key: tuple[str, str]):
+    count = ctx.timeouts.pop(key, (0, 0.0))[0]
+    ctx.timeouts[key] = (count + 1, time.monotonic())
+    while len(ctx.timeouts) > _BREAKER_ENTRIES:
+        del ctx.timeouts[next(iter(ctx.timeouts))]
+
+
+# --- Nodes ---
+async def planner(ctx: _BrewContext, state: BrewState) -> dict:
+    # Extract last user message once per turn; later nodes read it from state
+    user_text = last_user_text(state.get("messages", []))
+    # worker_reports accumulate across turns; remember where this turn starts
+    reports_offset = len(state.get("worker_reports") or [])
+
+    route = classify_request(user_text)
+    if route == "direct":
         return {
-            "route": f"{assignment.worker}_worker",
-            "assignment": assignment,
+            "status": "Direct response",
+            "task_plan": TaskPlan(reasoning="Direct response", tasks=[]),
+            "last_user_text": user_text,
+            "reports_offset": reports_offset,
+            "dispatched_tasks": None,
+            "completed_tasks": None,
         }
 
-    async def _run_worker(
-        agent,
-        state: WorkerState,
-        worker_name: str,
-        override_task: str = None,
-        increment_index: bool = True,
-    ) -> dict:
-        assignment = state.get("assignment")
-        task_text = override_task if override_task else (assignment.task if assignment else "")
-
-        if not task_text:
-            return {
-                "worker_reports": [
-                    WorkerReport(
-                        worker=worker_name,
-                        task="",
-                        status="failed",
-                        result="Missing assignment.",
+    # Use general worker for non-web, non-marketing small questions
+    if route == "general":
+        return {
+            "task_plan": TaskPlan(
+                reasoning="General question - no internet needed",
+                tasks=[
+                    TaskAssignment(
+                        id="t1",
+                        worker="general",
+                        task=user_text,
+                        priority=1,
                     )
                 ],
-                "next_task_index": state.get("next_task_index", 0) + (1 if increment_index else 0),
-            }
+            ),
+            "status": "Planning complete: 1 tasks assigned",
+            "last_user_text": user_text,
+            "reports_offset": reports_offset,
+            "dispatched_tasks": None,
+            "completed_tasks": None,
+        }
 
-        try:
-            # Run deep agent; it can use tools internally.
-            result = await agent.ainvoke(
-                {"messages": [{"role": "user", "content": task_text}]}
-            )
-            # deepagents returns a LangGraph-like state; try common shapes
-            text = ""
-            if isinstance(result, dict) and "messages" in result and result["messages"]:
-                last = result["messages"][-1]
-                if isinstance(last, dict):
-                    text = str(last.get("content", ""))
-                else:
-                    text = getattr(last, "content", "") if last else ""
-            if not text:
-                text = str(result)
+    planner_input = [
+        _PLANNER_SYSTEM_MSG,
+        HumanMessage(content=f"Create a concise task plan for: {user_text}"),
+    ]
+    if ctx.batched_planner is not None:
+        resp = await ctx.batched_planner.submit(planner_input, get_config())
+    else:
+        resp = await ctx.planner_model.ainvoke(planner_input)
+    plan = TaskPlan.from_tool_args(resp.tool_calls[0]["args"] if resp.tool_calls else {})
+    # Sort tasks by priority (1 highest) so each wave dispatches deterministically
+    plan.tasks.sort(key=lambda t: t.priority or 2)
+    link_tasks(plan.tasks)
+    return {
+        "task_plan": plan,
+        "status": f"Planning complete: {len(plan.tasks)} tasks assigned",
+        "last_user_text": user_text,
+        "reports_offset": reports_offset,
+        "dispatched_tasks": None,
+        "completed_tasks": None,
+    }
+
+
+def executor(state: BrewState) -> Command:
+    """
+    Dispatch every task whose dependencies are complete, all at once.
+
+    Runs again whenever a worker (or the research debate loop) finishes, so
+    independent tasks overlap and each wave costs max(task) instead of sum(task).
+    """
+    plan = state.get("task_plan")
+    tasks = plan.tasks if plan else []
+    done = set(state.get("completed_tasks") or [])
+    dispatched = set(state.get("dispatched_tasks") or [])
+    in_flight = dispatched - done
+
+    pending = [t for t in tasks if t.id not in dispatched]
+    if not pending:
+        # Wait for in-flight workers; the last one to finish brings us back here
+        return Command(goto=[] if in_flight else "synthesizer")
+
+    ready = [t for t in pending if done.issuperset(t.depends_on)]
+    if not ready and not in_flight:
+        # Dependency cycle: run what's left rather than stall
+        ready = pending
+
+    # The research debate loop keeps its state in shared channels, so only
+    # one research chain runs at a time.
+    research_busy = any(t.worker == "research" and t.id in in_flight for t in tasks)
+    reports = {r.task: r for r in state.get("worker_reports", [])}
+    by_id = {t.id: t for t in tasks}
+    sends = []
+    for t in ready:
+        if t.worker == "research":
+            if research_busy:
+                continue
+            research_busy = True
+        deps = [reports[by_id[d].task] for d in t.depends_on if by_id[d].task in reports]
+        context = format_context(deps, _CONTEXT_MAX_CHARS)
+        sends.append(Send(_WORKER_NODE[t.worker], {"assignment": t, "context": context}))
+
+    if not sends:
+        return Command(goto=[])
+    return Command(
+        update={"dispatched_tasks": [s.arg["assignment"].id for s in sends]},
+        goto=sends,
+    )
+
+
+async def _run_worker(
+    ctx: _BrewContext,
+    state: WorkerState,
+    worker_name: str,
+    override_task: str = None,
+    complete: bool = True,
+    speculative: bool = False,
+) -> dict:
+    agent = ctx.agents[worker_name]
+    assignment = state.get("assignment")
+    task_text = override_task if override_task else (assignment.task if assignment else "")
+    context = state.get("context")
+    if task_text and context:
+        task_text = f"{task_text}\n\nRESULTS FROM EARLIER TASKS:\n{context}"
+    # Lets the executor schedule tasks that depend on this one
+    completed = [assignment.id] if complete and assignment else []
+
+    if not task_text:
+        return {
+            "worker_reports": [
+                WorkerReport(
+                    worker=worker_name,
+                    task="",
+                    status="failed",
+                    result="Missing assignment.",
+                )
+            ],
+            "completed_tasks": completed,
+        }
+
+    # Speculative runs may be thrown away, so they neither consult nor feed the
+    # circuit breaker and the result cache
+    breaker_key = None if speculative else _breaker_key(worker_name)
+    if breaker_key is not None and _breaker_open(ctx, breaker_key):
+        return {
+            "worker_reports": [
+                WorkerReport(
+                    worker=worker_name,
+                    task=assignment.task,
+                    status="failed",
+                    result="Worker skipped after repeated timeouts.",
+                )
+            ],
+            "completed_tasks": completed,
+        }
 
+    cache_key = None
+    if not speculative and get_llm_cache() is not None:
+        cache_key = _worker_cache_key(worker_name, ctx.tools_key, task_text)
+        cached = _worker_cache.get(cache_key)
+        if cached is not None:
+            _worker_cache.move_to_end(cache_key)
             return {
                 "worker_reports": [
                     WorkerReport(
                         worker=worker_name,
                         task=assignment.task,
                         status="success",
-                        result=text,
+                        result=cached,
+                        sources=extract_sources(cached),
                     )
                 ],
-                "next_task_index": state.get("next_task_index", 0) + (1 if increment_index else 0),
-            }
-        except Exception as e:
-            return {
-                "worker_reports": [
-                    WorkerReport(
-                        worker=worker_name,
-                        task=assignment.task,
-                        status="failed",
-                        result=f"Worker failed: {e}",
-                    )
-                ],
-                "next_task_index": state.get("next_task_index", 0) + (1 if increment_index else 0),
+                "completed_tasks": completed,
             }
 
-    async def research_worker(state: WorkerState) -> dict:
-        # 1. Prepare Delta Prompt
-        input_msg = state.get("assignment").task
-        feedback = state.get("critique_feedback", "")
-        existing_data = state.get("research_data", "")
-
-        if feedback:
-            # Round 2+: Incremental Research
-            input_msg = (
-                f"Original Task: {input_msg}\n\n"
-                f"EXISTING FINDINGS:\n{existing_data}\n\n"
-                f"CRITIQUE (MISSING INFO): {feedback}\n\n"
-                f"INSTRUCTION: Search ONLY for the missing items. Append them."
-            )
-            
-        # 2. Run Worker (no index increment)
-        res = await _run_worker(
-            research_agent, state, "research", override_task=input_msg, increment_index=False
-        )
-        
-        # 3. Accumulate Data (Append, don't overwrite)
-        new_text = res.get("worker_reports")[0].result
-        combined_text = existing_data + "\n\n" + new_text if existing_data else new_text
-        
-        current_iter = state.get("iteration_count", 0)
-        return {**res, "research_data": combined_text, "iteration_count": current_iter + 1}
-
-    async def reviewer_worker(state: WorkerState) -> dict:
-        # Reviewer analyzes the research data
-        # No index increment
-        research_text = state.get("research_data", "")
-        res = await _run_worker(
-            reviewer_agent, state, "reviewer", increment_index=False
-        )
-        # Extract critique result
-        critique = res.get("worker_reports")[0].result
-        return {**res, "critique_feedback": critique}
-
-    async def strategist_worker(state: WorkerState) -> dict:
-        # Strategist IS the node that completes the task logic.
-        # So we increment index here.
-        return await _run_worker(strategist_agent, state, "strategist", increment_index=True)
+    timeout = _WORKER_TIMEOUTS.get(worker_name, WORKER_TIMEOUT)
+    try:
+        # Run deep agent; it can use tools internally. Waiting for a slot
+        # doesn't count towards the timeout.
+        async with _worker_slots or nullcontext():
+            async with asyncio.timeout(timeout):
+                result = await agent.ainvoke(
+                    {"messages": [{"role": "user", "content": task_text}]}
+                )
+        if breaker_key is not None:
+            ctx.timeouts.pop(breaker_key, None)
+        # deepagents returns a LangGraph-like state; try common shapes
+        text = ""
+        if isinstance(result, dict) and "messages" in result and result["messages"]:
+            last = result["messages"][-1]
+            if isinstance(last, dict):
+                text = str(last.get("content", ""))
+            else:
+                text = getattr(last, "content", "") if last else ""
+        if not text:
+            text = str(result)
+
+        if cache_key is not None:
+            _worker_cache[cache_key] = text
+            if len(_worker_cache) > _WORKER_CACHE_SIZE:
+                _worker_cache.popitem(last=False)
 
-    async def content_worker(state: WorkerState) -> dict:
-        return await _run_worker(content_agent, state, "content")
+        return {
+            "worker_reports": [
+                WorkerReport(
+                    worker=worker_name,
+                    task=assignment.task,
+                    status="success",
+                    result=text,
+                    sources=extract_sources(text),
+                )
+            ],
+            "completed_tasks": completed,
+        }
+    except TimeoutError:
+        if breaker_key is not None:
+            _record_timeout(ctx, breaker_key)
+        return {
+            "worker_reports": [
+                WorkerReport(
+                    worker=worker_name,
+                    task=assignment.task,
+                    status="failed",
+                    result=f"Worker timed out after {timeout:g}s.",
+                )
+            ],
+            "completed_tasks": completed,
+        }
+    except Exception as e:
+        return {
+            "worker_reports": [
+                WorkerReport(
+                    worker=worker_name,
+                    task=assignment.task,
+                    status="failed",
+                    result=f"Worker failed: {e}",
+                )
+            ],
+            "completed_tasks": completed,
+        }
 
-    async def analytics_worker(state: WorkerState) -> dict:
-        return await _run_worker(analytics_agent, state, "analytics")
 
-    async def social_worker(state: WorkerState) -> dict:
-        return await _run_worker(social_agent, state, "social")
+async def research_worker(ctx: _BrewContext, state: WorkerState) -> dict:
+    # 1. Prepare Delta Prompt
+    input_msg = state.get("assignment").task
+    feedback = state.get("critique_feedback", "")
+    existing_data = state.get("research_data", "")
 
-    async def report_worker(state: WorkerState) -> dict:
-        return await _run_worker(report_agent, state, "report")
+    if feedback:
+        # Round 2+: Incremental Research
+        input_msg = (
+            f"Original Task: {input_msg}\n\n"
+            f"EXISTING FINDINGS:\n{existing_data}\n\n"
+            f"CRITIQUE (MISSING INFO): {feedback}\n\n"
+            f"INSTRUCTION: Search ONLY for the missing items. Append them."
+        )
 
-    async def general_worker(state: WorkerState) -> dict:
-        return await _run_worker(general_agent, state, "general")
+    # 2. Run Worker (the task completes once the strategist is done),
+    # unless the reviewer already ran this round speculatively
+    speculative = state.get("speculative_research")
+    if feedback and speculative is not None:
+        res = {"worker_reports": [speculative], "completed_tasks": []}
+    else:
+        res = await _run_worker(
+            ctx, state, "research", override_task=input_msg, complete=False
+        )
 
-    async def synthesizer(state: BrewState) -> dict:
-        # Extract user request (best-effort)
-        user_text = ""
-        for msg in reversed(state.get("messages", [])):
-            if hasattr(msg, "content"):
-                user_text = (
-                    msg.content if isinstance(msg.content, str) else str(msg.content)
-                )
-                break
-            if isinstance(msg, dict) and "content" in msg:
-                user_text = str(msg["content"])
-                break
-
-        reports = state.get("worker_reports", [])
-        reports_text = "\n\n".join(
-            [
-                f"## {r.worker} ({r.status})\nTask: {r.task}\n\n{r.result}"
-                for r in reports
-            ]
+    # 3. Accumulate Data (Append, don't overwrite)
+    new_text = res.get("worker_reports")[0].result
+    combined_text = existing_data + "\n\n" + new_text if existing_data else new_text
+
+    current_iter = state.get("iteration_count", 0)
+    return {
+        **res,
+        # Keep the assignment for the reviewer/strategist steps of this chain
+        "assignment": state.get("assignment"),
+        "research_data": combined_text,
+        "iteration_count": current_iter + 1,
+        "speculative_research": None,
+    }
+
+
+async def reviewer_worker(ctx: _BrewContext, state: WorkerState) -> dict:
+    # Reviewer analyzes the research data
+    research_text = state.get("research_data", "")
+
+    # Most rounds end in REJECT, so optionally start the next research delta
+    # now, against the editor's known checklist. It is kept only when the real
+    # critique rejects for checklist items alone; otherwise research reruns
+    # against the actual critique.
+    speculation = None
+    if SPECULATIVE_DEBATE and state.get("iteration_count", 0) < MAX_DEBATE_ROUNDS:
+        assignment = state.get("assignment")
+        speculative_msg = (
+            f"Original Task: {assignment.task}\n\n"
+            f"EXISTING FINDINGS:\n{research_text}\n\n"
+            f"CRITIQUE (ANTICIPATED): {_ANTICIPATED_CRITIQUE}\n\n"
+            f"INSTRUCTION: Search ONLY for whichever of these items is missing. Append them."
+        )
+        speculation = asyncio.create_task(
+            _run_worker(
+                ctx,
+                state,
+                "research",
+                override_task=speculative_msg,
+                complete=False,
+                speculative=True,
+            )
         )
 
-        # Use streaming-enabled model so callbacks emit token events.
-        messages = [
-            SystemMessage(content=MASTER_SYNTH_SYSTEM),
-            HumanMessage(
-                content=f"User request:\n{user_text}\n\nWorker reports:\n{reports_text}"
-            ),
-        ]
+    try:
+        res = await _run_worker(ctx, state, "reviewer", complete=False)
+    except BaseException:
+        if speculation is not None:
+            speculation.cancel()
+        raise
+    # Extract critique result
+    critique = res.get("worker_reports")[0].result
+
+    speculative_report = None
+    if speculation is not None:
+        if "REJECT" in critique and critique_anticipated(critique):
+            report = (await speculation)["worker_reports"][0]
+            # A failed speculative round is redone for real
+            if report.status == "success":
+                speculative_report = report
+        else:
+            speculation.cancel()
+    return {
+        **res,
+        "critique_feedback": critique,
+        "speculative_research": speculative_report,
+    }
+
+
+async def task_worker(ctx: _BrewContext, worker_name: str, state: WorkerState) -> dict:
+    """Run one assignment on a single-shot worker (content, analytics, social, ...)."""
+    return await _run_worker(ctx, state, worker_name)
+
+
+async def synthesizer(ctx: _BrewContext, state: BrewState) -> dict:
+    user_text = state.get("last_user_text", "")
+
+    reports = state.get("worker_reports", [])
+
+    # A single small report from a self-contained worker needs no rewriting
+    offset = state.get("reports_offset", 0)
+    turn_reports = reports[offset:]
+    if len(turn_reports) == 1:
+        only = turn_reports[0]
+        if (
+            only.status == "success"
+            and only.worker in _PASSTHROUGH_WORKERS
+            and len(only.result) < _PASSTHROUGH_MAX_CHARS
+        ):
+            return {"final_response": only.result, "status": "Synthesis complete"}
+
+    synth_reports = reports[max(0, offset - _SYNTH_HISTORY_REPORTS) :]
+    reports_text = format_reports(synth_reports)
+    prompt = f"User request:\n{user_text}\n\nWorker reports:\n{reports_text}"
+    # Sources are deduplicated here rather than left to the model
+    sources = dedupe_sources(synth_reports)
+    if sources:
+        prompt += "\n\nSources (deduplicated):\n" + "\n".join(f"- {s}" for s in sources)
+
+    # Stream the model so token events reach the client as they are generated,
+    # rather than only once the full report is done.
+    messages = [_SYNTH_SYSTEM_MSG, HumanMessage(content=prompt)]
+
+    resp = None
+    async for chunk in ctx.model.astream(messages, **_SYNTH_CALL_KWARGS):
+        resp = chunk if resp is None else resp + chunk
+    content = resp.content if resp is not None else ""
+    text = content if isinstance(content, str) else str(content)
+    return {"final_response": text, "status": "Synthesis complete"}
+
+
+# Compiled graphs, keyed by (model, tools, checkpointer, date). Values hold the
+# keyed objects too, so their ids can't be reused while the entry exists.
+_GRAPH_CACHE: dict[tuple, tuple] = {}
 
-        resp = await model.ainvoke(messages)
-        text = resp.content if isinstance(resp.content, str) else str(resp.content)
-        return {"final_response": text, "status": "Synthesis complete"}
+
+def create_brew_graph(
+    model: BaseChatModel,
+    tools: List[BaseTool],
+    checkpointer: BaseCheckpointSaver | None = None,
+):
+    """
+    Brew mode: tool-less master supervisor + parallel Deep Agents workers.
+
+    - planner: tool-less master, structured plan (tasks with dependencies)
+    - executor: dispatches every task whose dependencies are done, in waves
+    - workers: deepagents workers with tools (Tavily MCP), run concurrently within a wave
+    - synthesizer: tool-less master, streams final response
+
+    The topology never changes, so the compiled graph is reused for the same
+    model, tools and checkpointer (worker prompts embed the date, hence the day).
+    """
+    today = datetime.date.today()
+    key = (id(model), tuple(id(t) for t in tools), id(checkpointer), today)
+    entry = _GRAPH_CACHE.get(key)
+    if entry is None:
+        for stale in [k for k in _GRAPH_CACHE if k[3] != today]:
+            del _GRAPH_CACHE[stale]
+        graph = _build_brew_graph(model, tools, checkpointer, today)
+        entry = _GRAPH_CACHE[key] = (model, tools, checkpointer, graph)
+    return entry[3]
+
+
+def _build_brew_graph(
+    model: BaseChatModel,
+    tools: List[BaseTool],
+    checkpointer: BaseCheckpointSaver | None,
+    today: datetime.date,
+):
+    # --- Create worker agents (tools ONLY here), all dated from one clock read ---
+    agents = {
+        "research": create_research_worker_agent(model, tools, today),
+        "content": create_content_worker_agent(model, tools, today),
+        "analytics": create_analytics_worker_agent(model, tools, today),
+        "social": create_social_worker_agent(model, tools, today),
+        "report": create_report_worker_agent(model, today=today),
+        "reviewer": create_reviewer_agent(model, today=today),
+        "strategist": create_strategist_agent(model, today=today),
+        "general": create_general_worker_agent(model, today=today),
+    }
+
+    planner_model = model.bind_tools(
+        [PLAN_TOOL], tool_choice="emit_plan", **_PLANNER_CALL_KWARGS
+    )
+    ctx = _BrewContext(
+        model=model,
+        planner_model=planner_model,
+        # Optionally coalesce planner calls from concurrent requests into one batch
+        batched_planner=(
+            BatchedPlanner(planner_model, window_ms=PLANNER_BATCH_MS)
+            if PLANNER_BATCH_MS > 0
+            else None
+        ),
+        tools_key=",".join(sorted(t.name for t in tools)),
+        agents=agents,
+    )
 
     # --- Build graph ---
+    # Nodes are module-level functions bound to this graph's context. Partials
+    # carry no type hints, so worker nodes declare their input schema explicitly.
     builder = StateGraph(BrewState)
-    builder.add_node("planner", planner)
-    builder.add_node("task_router", task_router)
-    builder.add_node("research_worker", research_worker)
-    builder.add_node("reviewer_worker", reviewer_worker)
-    builder.add_node("strategist_worker", strategist_worker)
-    builder.add_node("content_worker", content_worker)
-    builder.add_node("analytics_worker", analytics_worker)
-    builder.add_node("social_worker", social_worker)
-    builder.add_node("report_worker", report_worker)
-    builder.add_node("general_worker", general_worker)
-    builder.add_node("synthesizer", synthesizer)
-
-    builder.add_edge(START, "planner")
-    builder.add_edge("planner", "task_router")
-    builder.add_conditional_edges(
-        "task_router",
-        lambda state: state.get("route", "synthesizer"),
-        {
-            "research_worker": "research_worker",
-            "reviewer_worker": "reviewer_worker",
-            "strategist_worker": "strategist_worker",
-            "content_worker": "content_worker",
-            "analytics_worker": "analytics_worker",
-            "analytics_worker": "analytics_worker",
-            "social_worker": "social_worker",
-            "report_worker": "report_worker",
-            "general_worker": "general_worker",
-            "synthesizer": "synthesizer",
-        },
+    builder.add_node("planner", partial(planner, ctx), input_schema=BrewState)
+    builder.add_node("executor", executor)
+    builder.add_node(
+        "research_worker", partial(research_worker, ctx), input_schema=WorkerState
+    )
+    builder.add_node(
+        "reviewer_worker", partial(reviewer_worker, ctx), input_schema=WorkerState
     )
+    # The strategist IS the node that completes the research task.
+    for worker in ("strategist", "content", "analytics", "social", "report", "general"):
+        builder.add_node(
+            _WORKER_NODE[worker],
+            partial(task_worker, ctx, worker),
+            input_schema=WorkerState,
+        )
+    builder.add_node("synthesizer", partial(synthesizer, ctx), input_schema=BrewState)
 
-    # Debate Loop Logic
-    def should_continue_debate(state: BrewState):
-        feedback = state.get("critique_feedback", "")
-        iterations = state.get("iteration_count", 0)
-        
-        if "REJECT" in feedback and iterations < 3:
-            return "research_worker"
-        return "strategist_worker"
+    builder.add_edge(START, "planner")
+    builder.add_edge("planner", "executor")
+    # executor routes itself via Command(goto=[Send(...)] | "synthesizer")
 
     # Research -> Reviewer -> (Loop) or Strategist
     builder.add_edge("research_worker", "reviewer_worker")
@@ -377,22 +681,19 @@ def create_brew_graph(
         should_continue_debate,
         {
             "research_worker": "research_worker",
-            "strategist_worker": "strategist_worker"
-        }
+            "strategist_worker": "strategist_worker",
+        },
     )
-    # Strategist -> Report -> End (or Router if needed, for simplicity we go to Router/End)
-    # Actually current flow goes back to Task Router.
-    # We want Research task to stay in "Research Phase" until Strategist is done.
-    # So we bypass task_router for the internal loop.
-    builder.add_edge("strategist_worker", "task_router")
-
-    # builder.add_edge("research_worker", "task_router") # REMOVED: Managed by loop now
-    builder.add_edge("content_worker", "task_router")
-    builder.add_edge("analytics_worker", "task_router")
-    builder.add_edge("analytics_worker", "task_router")
-    builder.add_edge("social_worker", "task_router")
-    builder.add_edge("report_worker", "task_router")
-    builder.add_edge("general_worker", "task_router")
+    # The Research task stays in the "Research Phase" until the Strategist is done,
+    # so only the strategist (not research/reviewer) reports back to the executor.
+    builder.add_edge("strategist_worker", "executor")
+
+    # builder.add_edge("research_worker", "executor") # REMOVED: Managed by loop now
+    builder.add_edge("content_worker", "executor")
+    builder.add_edge("analytics_worker", "executor")
+    builder.add_edge("social_worker", "executor")
+    builder.add_edge("report_worker", "executor")
+    builder.add_edge("general_worker", "executor")
     builder.add_edge("synthesizer", END)
 
     return (
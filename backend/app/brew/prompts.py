@@ -12,6 +12,9 @@ Rules:
 - For greetings, identity questions, and simple/general questions: respond directly without using workers.
 - For complex requests: produce a task plan (1-3 tasks). Assign each task to the best worker.
 - Tasks must be specific and actionable.
+- Give every task a short id ("t1", "t2", ...). Tasks run in parallel unless they list
+  the ids of tasks they truly need in `depends_on` (e.g. social posts that build on content).
+  Keep dependencies to a minimum.
 """
 
 
@@ -22,7 +25,7 @@ You do NOT have external tool access.
 You will receive worker reports. Your job:
 - Combine them into a single, clear final answer.
 - Use a helpful structure (headings/bullets).
-- If sources are provided, include a Sources section at the end (dedupe, keep it short).
+- If sources are provided, include a Sources section at the end (they are already deduplicated; keep it short).
 """
 
 
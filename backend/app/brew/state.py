@@ -1,46 +1,108 @@
 from __future__ import annotations
 
 import operator
-from typing import Annotated, Literal, TypedDict
+from dataclasses import dataclass, field
+from typing import Annotated, Literal, TypedDict, get_args
 
 from pydantic import BaseModel, Field
 
 
 WorkerName = Literal["research", "content", "analytics", "social", "general", "report", "reviewer", "strategist"]
+WORKER_NAMES = frozenset(get_args(WorkerName))
 
 
-class TaskAssignment(BaseModel):
+# --- Planner tool schema (only used to generate the JSON schema sent to the model) ---
+
+
+class TaskAssignmentSchema(BaseModel):
+    id: str = Field(default="", description="Short unique task id, e.g. 't1'.")
     worker: WorkerName = Field(description="Which worker should do this task.")
     task: str = Field(description="Clear, specific task for the worker to execute.")
     priority: int = Field(
         default=2, ge=1, le=3, description="1=highest priority, 3=lowest."
     )
+    depends_on: list[str] = Field(
+        default_factory=list,
+        description="Ids of tasks whose results this task needs. Empty if independent.",
+    )
 
 
-class TaskPlan(BaseModel):
+class TaskPlanSchema(BaseModel):
     reasoning: str = Field(
         default="",
         description="Short explanation of why these workers/tasks were chosen.",
     )
-    tasks: list[TaskAssignment] = Field(default_factory=list)
+    tasks: list[TaskAssignmentSchema] = Field(default_factory=list)
+
+
+# --- Graph state objects (plain slotted dataclasses, no runtime validation) ---
 
 
-class WorkerReport(BaseModel):
+@dataclass(slots=True)
+class TaskAssignment:
+    worker: WorkerName
+    task: str
+    id: str = ""
+    priority: int = 2
+    depends_on: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class TaskPlan:
+    reasoning: str = ""
+    tasks: list[TaskAssignment] = field(default_factory=list)
+
+    @classmethod
+    def from_tool_args(cls, args: dict) -> TaskPlan:
+        """Build a plan from already-parsed tool-call arguments (see TaskPlanSchema)."""
+        tasks = []
+        for t in args.get("tasks") or []:
+            if not isinstance(t, dict) or t.get("worker") not in WORKER_NAMES or not t.get("task"):
+                continue
+            try:
+                priority = min(max(int(t.get("priority") or 2), 1), 3)
+            except (TypeError, ValueError):
+                priority = 2
+            tasks.append(
+                TaskAssignment(
+                    worker=t["worker"],
+                    task=str(t["task"]),
+                    id=str(t.get("id") or ""),
+                    priority=priority,
+                    depends_on=[str(d) for d in t.get("depends_on") or []],
+                )
+            )
+        return cls(reasoning=str(args.get("reasoning") or ""), tasks=tasks)
+
+
+@dataclass(slots=True)
+class WorkerReport:
     worker: WorkerName
     task: str
     status: Literal["success", "partial", "failed"] = "success"
     result: str = ""
-    sources: list[str] = Field(default_factory=list)
+    sources: list[str] = field(default_factory=list)
+
+
+def add_or_reset(left: list | None, right: list | None) -> list:
+    """Append like operator.add, but an update of None clears the list."""
+    if right is None:
+        return []
+    return (left or []) + right
 
 
 class BrewState(TypedDict, total=False):
     # Conversation
     messages: list
+    last_user_text: str  # Set by the planner once per turn
 
     # Planning / execution
     task_plan: TaskPlan
     worker_reports: Annotated[list[WorkerReport], operator.add]
-    next_task_index: int
+    reports_offset: int  # Index of this turn's first worker report
+    # Task ids handed to workers / finished in the current turn (reset by the planner)
+    dispatched_tasks: Annotated[list[str], add_or_reset]
+    completed_tasks: Annotated[list[str], add_or_reset]
 
     # Debate / Research Loop State
     research_data: str  # Raw research findings
@@ -54,10 +116,12 @@ class BrewState(TypedDict, total=False):
 
 class WorkerState(TypedDict, total=False):
     assignment: TaskAssignment
+    context: str  # Results of the tasks this assignment depends on
     worker_reports: Annotated[list[WorkerReport], operator.add]
-    next_task_index: int
-    
+    completed_tasks: Annotated[list[str], add_or_reset]
+
     # Pass through for sub-loops
     research_data: str
     critique_feedback: str
     iteration_count: int
+    speculative_research: WorkerReport | None  # Next research round, run during review
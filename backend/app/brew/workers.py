@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from typing import List
 import datetime
 
@@ -20,82 +21,181 @@ from .prompts import (
 )
 
 
-def _get_dated_prompt(prompt: str) -> str:
-    now = datetime.datetime.now().strftime("%d %B %Y")
-    return f"CURRENT DATE: {now}\n\n{prompt}"
-
-
-def create_research_worker_agent(model: BaseChatModel, tools: List[BaseTool]):
-    return create_deep_agent(
-        model=model,
-        # Research worker gets ALL tools (Tavily + Marketing)
-        tools=tools,
-        subagents=[],
-        system_prompt=_get_dated_prompt(RESEARCH_WORKER_SYSTEM),
+def _get_dated_prompt(prompt: str, today: datetime.date) -> str:
+    now = today.strftime("%d %B %Y")
+    # Filled in once per agent build; prompts may contain other literal braces
+    prompt = prompt.replace("{current_date}", now)
+    # The date goes last so the static instructions stay a byte-stable prefix
+    # for provider-side prompt caching across days
+    return f"{prompt}\n\nCURRENT DATE: {now}"
+
+
+# Built worker agents, keyed by (kind, model, tools, date), least recently used
+# first. Values hold the model and tools too, so the ids in the key can't be
+# reused while the entry exists.
+_WORKER_CACHE: OrderedDict[tuple, tuple] = OrderedDict()
+_WORKER_CACHE_SIZE = 32
+
+
+def _cached_agent(
+    kind: str,
+    model: BaseChatModel,
+    tools: List[BaseTool],
+    build,
+    today: datetime.date | None = None,
+):
+    """Return the agent for this (kind, model, tools) built for `today`, building it once."""
+    today = today or datetime.date.today()
+    key = (kind, id(model), tuple(id(t) for t in tools), today)
+    entry = _WORKER_CACHE.get(key)
+    if entry is not None:
+        _WORKER_CACHE.move_to_end(key)
+        return entry[2]
+
+    # Prompts embed the date, so agents from earlier days are dropped
+    for stale in [k for k in _WORKER_CACHE if k[3] != today]:
+        del _WORKER_CACHE[stale]
+    entry = _WORKER_CACHE[key] = (model, tools, build(today))
+    if len(_WORKER_CACHE) > _WORKER_CACHE_SIZE:
+        _WORKER_CACHE.popitem(last=False)
+    return entry[2]
+
+
+def create_research_worker_agent(
+    model: BaseChatModel, tools: List[BaseTool], today: datetime.date | None = None
+):
+    return _cached_agent(
+        "research",
+        model,
+        tools,
+        lambda today: create_deep_agent(
+            model=model,
+            # Research worker gets ALL tools (Tavily + Marketing)
+            tools=tools,
+            subagents=[],
+            system_prompt=_get_dated_prompt(RESEARCH_WORKER_SYSTEM, today),
+        ),
+        today,
     )
 
 
-def create_report_worker_agent(model: BaseChatModel):
+def create_report_worker_agent(
+    model: BaseChatModel, today: datetime.date | None = None
+):
     # Report worker focuses on writing, no tools needed (uses context)
-    return create_deep_agent(
-        model=model,
-        tools=[],
-        subagents=[],
-        system_prompt=_get_dated_prompt(REPORT_WORKER_SYSTEM),
+    return _cached_agent(
+        "report",
+        model,
+        [],
+        lambda today: create_deep_agent(
+            model=model,
+            tools=[],
+            subagents=[],
+            system_prompt=_get_dated_prompt(REPORT_WORKER_SYSTEM, today),
+        ),
+        today,
     )
 
 
-def create_reviewer_agent(model: BaseChatModel):
+def create_reviewer_agent(
+    model: BaseChatModel, today: datetime.date | None = None
+):
     # Reviewer acts as a critic, no tools usually needed (uses internal knowledge)
-    return create_deep_agent(
-        model=model,
-        tools=[],
-        subagents=[],
-        system_prompt=_get_dated_prompt(REVIEWER_WORKER_SYSTEM),
+    return _cached_agent(
+        "reviewer",
+        model,
+        [],
+        lambda today: create_deep_agent(
+            model=model,
+            tools=[],
+            subagents=[],
+            system_prompt=_get_dated_prompt(REVIEWER_WORKER_SYSTEM, today),
+        ),
+        today,
     )
 
 
-def create_strategist_agent(model: BaseChatModel):
-    return create_deep_agent(
-        model=model,
-        tools=[],
-        subagents=[],
-        system_prompt=_get_dated_prompt(STRATEGIST_WORKER_SYSTEM),
+def create_strategist_agent(
+    model: BaseChatModel, today: datetime.date | None = None
+):
+    return _cached_agent(
+        "strategist",
+        model,
+        [],
+        lambda today: create_deep_agent(
+            model=model,
+            tools=[],
+            subagents=[],
+            system_prompt=_get_dated_prompt(STRATEGIST_WORKER_SYSTEM, today),
+        ),
+        today,
     )
 
 
-def create_content_worker_agent(model: BaseChatModel, tools: List[BaseTool]):
-    return create_deep_agent(
-        model=model,
-        tools=tools,
-        subagents=[],
-        system_prompt=_get_dated_prompt(CONTENT_WORKER_SYSTEM),
+def create_content_worker_agent(
+    model: BaseChatModel, tools: List[BaseTool], today: datetime.date | None = None
+):
+    return _cached_agent(
+        "content",
+        model,
+        tools,
+        lambda today: create_deep_agent(
+            model=model,
+            tools=tools,
+            subagents=[],
+            system_prompt=_get_dated_prompt(CONTENT_WORKER_SYSTEM, today),
+        ),
+        today,
     )
 
 
-def create_analytics_worker_agent(model: BaseChatModel, tools: List[BaseTool]):
-    return create_deep_agent(
-        model=model,
-        tools=tools,
-        subagents=[],
-        system_prompt=_get_dated_prompt(ANALYTICS_WORKER_SYSTEM),
+def create_analytics_worker_agent(
+    model: BaseChatModel, tools: List[BaseTool], today: datetime.date | None = None
+):
+    return _cached_agent(
+        "analytics",
+        model,
+        tools,
+        lambda today: create_deep_agent(
+            model=model,
+            tools=tools,
+            subagents=[],
+            system_prompt=_get_dated_prompt(ANALYTICS_WORKER_SYSTEM, today),
+        ),
+        today,
     )
 
 
-def create_social_worker_agent(model: BaseChatModel, tools: List[BaseTool]):
-    return create_deep_agent(
-        model=model,
-        tools=tools,
-        subagents=[],
-        system_prompt=_get_dated_prompt(SOCIAL_WORKER_SYSTEM),
+def create_social_worker_agent(
+    model: BaseChatModel, tools: List[BaseTool], today: datetime.date | None = None
+):
+    return _cached_agent(
+        "social",
+        model,
+        tools,
+        lambda today: create_deep_agent(
+            model=model,
+            tools=tools,
+            subagents=[],
+            system_prompt=_get_dated_prompt(SOCIAL_WORKER_SYSTEM, today),
+        ),
+        today,
     )
 
 
-def create_general_worker_agent(model: BaseChatModel):
+def create_general_worker_agent(
+    model: BaseChatModel, today: datetime.date | None = None
+):
     # General worker has NO external tools
-    return create_deep_agent(
-        model=model,
-        tools=[],
-        subagents=[],
-        system_prompt=_get_dated_prompt(GENERAL_WORKER_SYSTEM),
+    return _cached_agent(
+        "general",
+        model,
+        [],
+        lambda today: create_deep_agent(
+            model=model,
+            tools=[],
+            subagents=[],
+            system_prompt=_get_dated_prompt(GENERAL_WORKER_SYSTEM, today),
+        ),
+        today,
     )
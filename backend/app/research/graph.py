@@ -6,7 +6,7 @@ subagents for discovery and extraction.
 """
 
 from typing import List
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain_core.language_models import BaseChatModel
 from langchain_core.tools import BaseTool
 
@@ -17,7 +17,7 @@ from .subagents import create_subagent_configs
 def create_research_graph(
     model: BaseChatModel,
     tools: List[BaseTool],
-    checkpointer: MemorySaver = None,
+    checkpointer: BaseCheckpointSaver | None = None,
 ):
     """
     Create the Research Mode graph using deepagents.
@@ -51,7 +51,7 @@ def create_research_graph(
     Args:
         model: The language model to use
         tools: List of tools (Tavily search/extract)
-        checkpointer: Optional memory checkpointer
+        checkpointer: Optional checkpointer (in-memory, SQLite or PostgreSQL)
 
     Returns:
         Compiled deep agent graph
@@ -76,7 +76,7 @@ def create_research_graph(
 def create_research_graph_simple(
     model: BaseChatModel,
     tools: List[BaseTool],
-    checkpointer: MemorySaver = None,
+    checkpointer: BaseCheckpointSaver | None = None,
 ):
     """
     Create a simpler Research Mode graph without subagents.
@@ -87,7 +87,7 @@ def create_research_graph_simple(
     Args:
         model: The language model to use
         tools: List of tools (Tavily search/extract)
-        checkpointer: Optional memory checkpointer
+        checkpointer: Optional checkpointer (in-memory, SQLite or PostgreSQL)
 
     Returns:
         Compiled deep agent graph (single agent mode)
@@ -19,10 +19,12 @@ Research is a two-stage process:
 #### Stage A: Discovery (Search)
 - Use `tavily_search` to find high-quality URLs
 - Cast a wide net with varied search queries
+- Your discovery queries are independent: issue them all as parallel tool calls in a single turn (and delegate independent sub-topics to subagents in the same turn), rather than one query per turn
 - **IMPORTANT**: Search snippets are only for discovery; they are NOT sufficient for comprehensive research
 
 #### Stage B: Deep-Dive (Extraction)
 - For the top 3-5 most relevant URLs found during discovery, you **MUST** use `tavily_extract` to retrieve full page content
+- Pass all of those URLs together in a single `tavily_extract` call (its `urls` argument takes a list) instead of one call per URL
 - **DO NOT** summarize until you have read the actual body text of primary sources
 - **DO NOT** provide a summary after every tool call - maintain silence while working
 - Execute tools until every research-related todo is complete
@@ -56,7 +58,7 @@ DISCOVERY_AGENT_PROMPT = """You are the Discovery Expert, a specialized research
 - Pass high-quality URLs to the Master for deep-diving
 
 ## Guidelines
-- Search multiple times with different query variations
+- Search multiple times with different query variations, issuing the searches as parallel tool calls in one turn
 - Look for primary sources (official sites, research papers)
 - Include diverse perspectives when relevant
 - Note source credibility in your findings
@@ -72,6 +74,7 @@ EXTRACTION_AGENT_PROMPT = """You are the Extraction Specialist, a specialized ag
 
 ## Your Role
 - Use `tavily_extract` to retrieve full page content from URLs
+- Batch the URLs: pass every URL you were given in one `tavily_extract` call (`urls` takes a list, up to 20)
 - Focus on getting the FULL content, not just snippets
 - Extract structured data when available
 - Handle technical documentation carefully
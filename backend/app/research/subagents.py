@@ -11,6 +11,19 @@ from langchain_core.tools import BaseTool
 
 from .prompts import DISCOVERY_AGENT_PROMPT, EXTRACTION_AGENT_PROMPT
 
+# Static parts of each subagent spec; only model/tools vary per build.
+_DISCOVERY_AGENT_TMPL = {
+    "name": "research-agent",
+    "description": "Expert in global discovery. Use this to find the best URLs and initial facts across the web.",
+    "system_prompt": DISCOVERY_AGENT_PROMPT,
+}
+
+_EXTRACTION_AGENT_TMPL = {
+    "name": "crawl-agent",
+    "description": "Expert in deep extraction. Use this to scrape full text, technical docs, and structured data from specific URLs.",
+    "system_prompt": EXTRACTION_AGENT_PROMPT,
+}
+
 
 def create_subagent_configs(
     model: BaseChatModel,
@@ -26,20 +39,7 @@ def create_subagent_configs(
     Returns:
         List of subagent configuration dictionaries
     """
-    discovery_agent = {
-        "name": "research-agent",
-        "description": "Expert in global discovery. Use this to find the best URLs and initial facts across the web.",
-        "model": model,
-        "tools": tools,
-        "system_prompt": DISCOVERY_AGENT_PROMPT,
-    }
-
-    extraction_agent = {
-        "name": "crawl-agent",
-        "description": "Expert in deep extraction. Use this to scrape full text, technical docs, and structured data from specific URLs.",
-        "model": model,
-        "tools": tools,
-        "system_prompt": EXTRACTION_AGENT_PROMPT,
-    }
-
-    return [discovery_agent, extraction_agent]
+    return [
+        {**_DISCOVERY_AGENT_TMPL, "model": model, "tools": tools},
+        {**_EXTRACTION_AGENT_TMPL, "model": model, "tools": tools},
+    ]
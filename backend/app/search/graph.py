@@ -5,20 +5,71 @@ Optimized for quick answers to everyday questions.
 Uses a simple ReAct loop without multi-agent coordination.
 """
 
+import asyncio
 from typing import List
 from langgraph.graph import StateGraph, START, END, MessagesState
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain_core.language_models import BaseChatModel
 from langchain_core.tools import BaseTool
-from langchain_core.messages import SystemMessage, ToolMessage
+from langchain_core.messages import SystemMessage, ToolMessage, message_chunk_to_message
 
 from .prompts import SEARCH_SYSTEM_PROMPT
 
+# The system prompt never changes, so one message object serves every call
+_SEARCH_SYSTEM_MSG = SystemMessage(content=SEARCH_SYSTEM_PROMPT)
+
+# Tool output from earlier turns is cut to this many characters when resent;
+# the answers built from it are already in the history
+_PAST_TOOL_OUTPUT_CHARS = 1500
+
+
+# Cap on one tool result (tavily_extract returns whole pages); everything kept here
+# is resent on every later model call of the turn
+_MAX_TOOL_OUTPUT_CHARS = 16000
+
+
+def _tool_output_text(result) -> str:
+    """Text of a tool result, capped at _MAX_TOOL_OUTPUT_CHARS."""
+    if isinstance(result, list):
+        # MCP tools return content blocks; str() of the list would escape every newline
+        text = "\n".join(
+            block["text"]
+            if isinstance(block, dict) and block.get("type") == "text"
+            else str(block)
+            for block in result
+        )
+    else:
+        text = str(result)
+    if len(text) > _MAX_TOOL_OUTPUT_CHARS:
+        text = text[:_MAX_TOOL_OUTPUT_CHARS] + " …[truncated]"
+    return text
+
+
+def _trim_past_tool_outputs(messages: list) -> list:
+    """Shorten tool results from earlier turns; the current turn's results stay whole."""
+    turn_start = next(
+        (i for i in range(len(messages) - 1, -1, -1) if messages[i].type == "human"), 0
+    )
+    trimmed = None
+    for i in range(turn_start):
+        msg = messages[i]
+        if (
+            isinstance(msg, ToolMessage)
+            and isinstance(msg.content, str)
+            and len(msg.content) > _PAST_TOOL_OUTPUT_CHARS
+        ):
+            if trimmed is None:
+                trimmed = list(messages)
+            trimmed[i] = msg.model_copy(
+                update={"content": msg.content[:_PAST_TOOL_OUTPUT_CHARS] + " …[truncated]"}
+            )
+    return messages if trimmed is None else trimmed
+
 
 def create_search_graph(
     model: BaseChatModel,
     tools: List[BaseTool],
-    checkpointer: MemorySaver = None,
+    checkpointer: BaseCheckpointSaver | None = None,
 ):
     """
     Create the Search Mode graph.
@@ -45,54 +96,59 @@ def create_search_graph(
     Args:
         model: The language model to use
         tools: List of tools (Tavily search/extract)
-        checkpointer: Optional memory checkpointer
+        checkpointer: Optional checkpointer (in-memory, SQLite or PostgreSQL)
 
     Returns:
         Compiled StateGraph
     """
 
+    # Tools are fixed for the life of the graph, so their schemas are bound once
+    model_with_tools = model.bind_tools(tools)
+
     async def search_agent(state: MessagesState) -> dict:
         """Main search agent node - calls the LLM with tools bound."""
-        messages = state["messages"]
+        messages = _trim_past_tool_outputs(state["messages"])
 
         # Prepend system prompt
-        full_messages = [
-            SystemMessage(content=SEARCH_SYSTEM_PROMPT),
-            *messages,
-        ]
+        full_messages = [_SEARCH_SYSTEM_MSG, *messages]
 
-        # Bind tools and invoke
-        model_with_tools = model.bind_tools(tools)
-        response = await model_with_tools.ainvoke(full_messages)
+        # Stream, so the answer reaches the client token by token
+        response = None
+        async for chunk in model_with_tools.astream(full_messages):
+            response = chunk if response is None else response + chunk
+        if response is None:
+            # An empty stream carries no message; ask again without streaming
+            return {"messages": [await model_with_tools.ainvoke(full_messages)]}
 
-        return {"messages": [response]}
+        return {"messages": [message_chunk_to_message(response)]}
 
-    async def tool_executor(state: MessagesState) -> dict:
-        """Execute tool calls from the last message."""
-        last_message = state["messages"][-1]
-        tool_messages = []
+    tools_by_name = {tool.name: tool for tool in tools}
 
-        for tool_call in last_message.tool_calls:
-            # Find the matching tool
+    async def _run_tool_call(tool_call: dict) -> ToolMessage:
+        """Run one tool call, turning failures into the tool's reply."""
+        tool = tools_by_name.get(tool_call["name"])
+        if tool is None:
             tool_result = f"Tool {tool_call['name']} not found"
+        else:
+            try:
+                result = await tool.ainvoke(tool_call["args"])
+                tool_result = _tool_output_text(result)
+            except Exception as e:
+                tool_result = f"Error executing {tool_call['name']}: {str(e)}"
+
+        return ToolMessage(
+            content=tool_result,
+            tool_call_id=tool_call["id"],
+        )
 
-            for tool in tools:
-                if tool.name == tool_call["name"]:
-                    try:
-                        result = await tool.ainvoke(tool_call["args"])
-                        tool_result = str(result)
-                    except Exception as e:
-                        tool_result = f"Error executing {tool_call['name']}: {str(e)}"
-                    break
-
-            tool_messages.append(
-                ToolMessage(
-                    content=tool_result,
-                    tool_call_id=tool_call["id"],
-                )
-            )
+    async def tool_executor(state: MessagesState) -> dict:
+        """Execute the tool calls from the last message concurrently."""
+        last_message = state["messages"][-1]
+        tool_messages = await asyncio.gather(
+            *(_run_tool_call(tool_call) for tool_call in last_message.tool_calls)
+        )
 
-        return {"messages": tool_messages}
+        return {"messages": list(tool_messages)}
 
     def should_continue(state: MessagesState) -> str:
         """Determine if we should continue with tool execution or end."""
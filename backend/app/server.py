@@ -2,39 +2,127 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from .agent import agent_manager
-import json
+from .brew.state import TaskAssignment, TaskPlan, WorkerReport
+import orjson
 from contextlib import asynccontextmanager
 import os
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 import asyncio
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Log records are queued and written to stdout by a background thread, so a slow
+# or backpressured stdout never stalls the event loop mid-stream. The thread runs
+# for the app's lifespan; records logged before it starts wait in the queue.
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
 
 # Configure logging (ensure handler even when uvicorn overrides root config)
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
+    handlers=[QueueHandler(_log_queue)],
     force=True,  # Force reconfiguration of the root logger
 )
 logger = logging.getLogger("deepagent-api")
 DEBUG_EVENTS = os.getenv("DEEPAGENT_DEBUG_EVENTS", "").strip() == "1"
+# Brew workers report streaming progress every this many generated characters
+WORKER_PROGRESS_CHARS = 400
+# Threads for blocking tool calls (sync tools run via run_in_executor); 0 keeps asyncio's default
+TOOL_POOL_SIZE = int(os.getenv("DEEPAGENT_TOOL_POOL_SIZE", "0") or 0)
+
+# Internal nodes that use structured output - don't stream their tokens
+# Planner uses structured output, but synthesizer should stream
+INTERNAL_NODES = frozenset({"planner", "StructuredOutput"})
+
+# Brew mode specific nodes
+BREW_STATUS = {
+    "planner": "🎯 Master Orchestrator planning tasks...",
+    "research_worker": "🔍 Research Specialist working...",
+    "content_worker": "✍️ Content Strategist working...",
+    "analytics_worker": "📊 Analytics Specialist working...",
+    "social_worker": "📱 Social Media Strategist working...",
+    "general_worker": "💬 General Assistant working...",
+    "synthesizer": "🧩 Synthesizing final response...",
+}
+
+# Legacy mode nodes
+LEGACY_STATUS = {
+    "research-agent": "Deep researching using Tavily...",
+    "crawl-agent": "Crawling website data...",
+    "master-agent": "Master Orchestrator planning...",
+    "agent": "Thinking and planning...",
+}
+
+# Internal planning tools, hidden from the search progress UI
+TODO_TOOLS = frozenset({"write_todos", "update_todos"})
+# Injected tool arguments that aren't worth showing
+HIDDEN_TOOL_INPUT_KEYS = frozenset({"runtime", "state"})
 logger.setLevel(logging.DEBUG if DEBUG_EVENTS else logging.INFO)
 if not logger.handlers:
-    logger.addHandler(logging.StreamHandler())
+    logger.addHandler(QueueHandler(_log_queue))
+
+
+def _dumps(obj) -> str:
+    """Serialize one stream event; orjson is several times faster than json.dumps."""
+    return orjson.dumps(obj).decode()
+
+
+def _blocks_text(blocks: list, sep: str = "") -> str:
+    """Text of a content-block list (text blocks and bare strings), joined in one pass."""
+    # Streamed chunks almost always carry a single block; skip the join
+    if len(blocks) == 1:
+        block = blocks[0]
+        if isinstance(block, str):
+            return block
+        if isinstance(block, dict) and block.get("type", "text") == "text":
+            return block.get("text", "")
+        return ""
+    return sep.join(
+        [
+            block if isinstance(block, str) else block.get("text", "")
+            for block in blocks
+            if isinstance(block, str)
+            or (isinstance(block, dict) and block.get("type", "text") == "text")
+        ]
+    )
+
+
+def _message_text(message: dict) -> str:
+    """Plain text of an incoming chat message; content may be a string or a list of parts."""
+    content = message.get("content", "")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return _blocks_text(content, "\n")
+    return str(content)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    logger.info("Initializing Agent Manager...")
-    await agent_manager.initialize()
-    logger.info("Agent Manager initialized.")
-    yield
-    # Shutdown
-    logger.info("Cleaning up Agent Manager...")
-    await agent_manager.cleanup()
-    logger.info("Cleanup complete.")
+    _log_listener.start()
+    try:
+        # Startup
+        if TOOL_POOL_SIZE > 0:
+            # Sync tools (HTTP scrapes, trends) block a thread for seconds each;
+            # size the pool so a burst of parallel tool calls doesn't queue
+            asyncio.get_running_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=TOOL_POOL_SIZE, thread_name_prefix="tool")
+            )
+        logger.info("Initializing Agent Manager...")
+        await agent_manager.initialize()
+        logger.info("Agent Manager initialized.")
+        yield
+        # Shutdown
+        logger.info("Cleaning up Agent Manager...")
+        await agent_manager.cleanup()
+        logger.info("Cleanup complete.")
+    finally:
+        # Flush queued records and end the writer thread
+        _log_listener.stop()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -64,7 +152,8 @@ async def chat_endpoint(request: Request):
     mode = data.get("mode")  # Can be null/None for brew mode (default)
 
     last_message = messages[-1] if messages else {"content": ""}
-    user_input = last_message.get("content", "")
+    # Normalized once here so the graphs only ever see string content
+    user_input = _message_text(last_message)
 
     # Determine effective mode
     # If mode is null/None, use "brew" as default
@@ -115,7 +204,7 @@ async def chat_endpoint(request: Request):
     )
 
     # Get the appropriate agent for the mode
-    agent = agent_manager.get_agent(effective_mode)
+    agent = await agent_manager.get_agent(effective_mode)
 
     async def event_generator():
         # Track current node to filter internal streaming
@@ -128,24 +217,10 @@ async def chat_endpoint(request: Request):
         emitted_plan = False
         emitted_final = False
         emitted_workers = set()  # Track which workers we've reported
+        worker_chars = {}  # Characters streamed so far per worker node
         last_status: Optional[str] = None
         emitted_synth_tokens = False
 
-        # Internal nodes that use structured output - don't stream their tokens
-        # Planner uses structured output, but synthesizer should stream
-        internal_nodes = {
-            "planner",
-            "StructuredOutput",
-        }
-
-        # Worker nodes - their output is captured via worker_reports, not streaming
-        brew_worker_nodes = {
-            "research_worker",
-            "content_worker",
-            "analytics_worker",
-            "social_worker",
-            "general_worker",
-        }
 
         # Track if we're in planner phase (to block its JSON tokens)
         in_planner_phase = False
@@ -155,6 +230,8 @@ async def chat_endpoint(request: Request):
         # Verbose per-event tracing is opt-in (very noisy)
         debug_events = DEBUG_EVENTS
 
+        # Long runs must not be evicted as idle while they stream
+        agent_manager.begin_thread_run(thread_id)
         try:
             async for event in agent.astream_events(
                 inputs, config=config, version="v2"
@@ -201,11 +278,11 @@ async def chat_endpoint(request: Request):
                             and not emitted_plan
                         ):
                             task_plan = output["task_plan"]
-                            if hasattr(task_plan, "tasks") and task_plan.tasks:
-                                reasoning = getattr(task_plan, "reasoning", "")
+                            if isinstance(task_plan, TaskPlan) and task_plan.tasks:
+                                reasoning = task_plan.reasoning
                                 first = True
                                 for t in task_plan.tasks:
-                                    yield json.dumps(
+                                    yield _dumps(
                                         {
                                             "type": "plan_delta",
                                             "worker": t.worker,
@@ -221,10 +298,10 @@ async def chat_endpoint(request: Request):
                     if name.endswith("_worker"):
                         if "worker_reports" in output:
                             for report in output.get("worker_reports", []):
-                                if hasattr(report, "worker"):
+                                if isinstance(report, WorkerReport):
                                     worker_key = f"{report.worker}:{report.task[:50]}"
                                     if worker_key not in emitted_workers:
-                                        yield json.dumps(
+                                        yield _dumps(
                                             {
                                                 "type": "worker_complete",
                                                 "worker": report.worker,
@@ -238,7 +315,7 @@ async def chat_endpoint(request: Request):
                     if "status" in output:
                         status_val = str(output["status"])
                         if status_val and status_val != last_status:
-                            yield json.dumps(
+                            yield _dumps(
                                 {"type": "status", "content": status_val}
                             ) + "\n"
                             last_status = status_val
@@ -255,8 +332,7 @@ async def chat_endpoint(request: Request):
                         )
                         is_direct_response = (
                             name == "planner"
-                            and task_plan
-                            and hasattr(task_plan, "tasks")
+                            and isinstance(task_plan, TaskPlan)
                             and not task_plan.tasks
                         )
 
@@ -267,7 +343,7 @@ async def chat_endpoint(request: Request):
                                 text = str(output["final_response"])
                                 chunk_size = 32
                                 for i in range(0, len(text), chunk_size):
-                                    yield json.dumps(
+                                    yield _dumps(
                                         {
                                             "type": "content",
                                             "content": text[i : i + chunk_size],
@@ -279,7 +355,7 @@ async def chat_endpoint(request: Request):
                                 # Synthesizer already streamed tokens; don't emit full final chunk.
                                 emitted_final = True
                         elif is_direct_response or not is_brew_mode:
-                            yield json.dumps(
+                            yield _dumps(
                                 {
                                     "type": "content",
                                     "content": output["final_response"],
@@ -299,7 +375,7 @@ async def chat_endpoint(request: Request):
                                 todo_data = todo_data["todos"]
                             if not isinstance(todo_data, list):
                                 todo_data = [str(todo_data)]
-                            yield json.dumps(
+                            yield _dumps(
                                 {"type": "plan", "content": todo_data}
                             ) + "\n"
 
@@ -309,12 +385,31 @@ async def chat_endpoint(request: Request):
                     stream_name = name or current_node
 
                     # Skip streaming from internal orchestration nodes
-                    if stream_name in internal_nodes:
+                    if stream_name in INTERNAL_NODES:
                         continue
 
                     # Brew mode: ONLY allow token streaming from synthesizer.
                     # This prevents worker deepagents tokens (and planner JSON) from leaking into the UI.
+                    # Workers stream concurrently, so report their progress instead.
                     if is_brew_mode and not in_synth_phase:
+                        ns = event.get("metadata", {}).get("langgraph_checkpoint_ns") or ""
+                        worker_node = ns.split(":", 1)[0]
+                        chunk = event["data"].get("chunk")
+                        if worker_node.endswith("_worker") and chunk is not None:
+                            content = chunk.content
+                            if isinstance(content, list):
+                                content = _blocks_text(content)
+                            before = worker_chars.get(worker_node, 0)
+                            after = before + len(content or "")
+                            worker_chars[worker_node] = after
+                            if after // WORKER_PROGRESS_CHARS > before // WORKER_PROGRESS_CHARS:
+                                yield _dumps(
+                                    {
+                                        "type": "worker_progress",
+                                        "worker": worker_node.replace("_worker", ""),
+                                        "chars": after,
+                                    }
+                                ) + "\n"
                         continue
 
                     # Block planner's structured output JSON tokens
@@ -363,7 +458,7 @@ async def chat_endpoint(request: Request):
                                                 or '"worker":"' in content
                                             ):
                                                 continue
-                                        yield json.dumps(
+                                        yield _dumps(
                                             {"type": "content", "content": content}
                                         ) + "\n"
                                         if is_brew_mode and in_synth_phase:
@@ -385,7 +480,7 @@ async def chat_endpoint(request: Request):
                             )
 
                         if thought:
-                            yield json.dumps(
+                            yield _dumps(
                                 {"type": "thought", "content": thought}
                             ) + "\n"
 
@@ -415,7 +510,7 @@ async def chat_endpoint(request: Request):
                                 stripped.startswith('{"') and stripped.endswith("}")
                             ) or (stripped.startswith("[{") and stripped.endswith("]"))
                             if not is_complete_json:
-                                yield json.dumps(
+                                yield _dumps(
                                     {"type": "content", "content": content}
                                 ) + "\n"
                                 if is_brew_mode and in_synth_phase:
@@ -430,49 +525,25 @@ async def chat_endpoint(request: Request):
                         task = ""
                         if isinstance(raw_input, dict) and "assignment" in raw_input:
                             assignment = raw_input.get("assignment")
-                            if hasattr(assignment, "task"):
+                            if isinstance(assignment, TaskAssignment):
                                 task = assignment.task
                             elif isinstance(assignment, dict):
                                 task = str(assignment.get("task", ""))
-                        yield json.dumps(
+                        yield _dumps(
                             {"type": "worker_start", "worker": worker, "task": task}
                         ) + "\n"
 
-                    # Brew mode specific nodes
-                    brew_status_map = {
-                        "planner": "🎯 Master Orchestrator planning tasks...",
-                        "research_worker": "🔍 Research Specialist working...",
-                        "content_worker": "✍️ Content Strategist working...",
-                        "analytics_worker": "📊 Analytics Specialist working...",
-                        "social_worker": "📱 Social Media Strategist working...",
-                        "general_worker": "💬 General Assistant working...",
-                        "synthesizer": "🧩 Synthesizing final response...",
-                    }
-
-                    # Legacy mode nodes
-                    legacy_status_map = {
-                        "research-agent": "Deep researching using Tavily...",
-                        "crawl-agent": "Crawling website data...",
-                        "master-agent": "Master Orchestrator planning...",
-                        "agent": "Thinking and planning...",
-                    }
-
                     # Check brew mode nodes first
-                    if name in brew_status_map:
-                        yield json.dumps(
-                            {"type": "status", "content": brew_status_map[name]}
-                        ) + "\n"
-                    elif name in legacy_status_map:
-                        yield json.dumps(
-                            {"type": "status", "content": legacy_status_map[name]}
-                        ) + "\n"
+                    status_text = BREW_STATUS.get(name) or LEGACY_STATUS.get(name)
+                    if status_text:
+                        yield _dumps({"type": "status", "content": status_text}) + "\n"
 
                 # Tool calls (Start)
                 elif kind == "on_tool_start":
                     tool_name = name or "tool"
 
                     # Filter out internal planning tools from the search progress UI
-                    if tool_name in ["write_todos", "update_todos"]:
+                    if tool_name in TODO_TOOLS:
                         continue
                     # Hide deepagents internal delegation tool noise in brew mode
                     if is_brew_mode and tool_name == "task":
@@ -488,9 +559,9 @@ async def chat_endpoint(request: Request):
                             ui_input = {
                                 k: v
                                 for k, v in raw_input.items()
-                                if k not in ["runtime", "state"]
+                                if k not in HIDDEN_TOOL_INPUT_KEYS
                             }
-                            tool_input = json.dumps(ui_input)
+                            tool_input = _dumps(ui_input)
                     else:
                         tool_input = str(raw_input)
 
@@ -499,7 +570,7 @@ async def chat_endpoint(request: Request):
                         tool_input = tool_input[:77] + "..."
 
                     logger.info(f"Tool Call Start: {tool_name} with {tool_input}")
-                    yield json.dumps(
+                    yield _dumps(
                         {
                             "type": "tool_start",
                             "tool": tool_name,
@@ -512,7 +583,7 @@ async def chat_endpoint(request: Request):
                 # Tool results (End)
                 elif kind == "on_tool_end":
                     tool_name = name or "tool"
-                    if tool_name in ["write_todos", "update_todos"]:
+                    if tool_name in TODO_TOOLS:
                         continue
                     if is_brew_mode and tool_name == "task":
                         continue
@@ -532,21 +603,14 @@ async def chat_endpoint(request: Request):
 
                         # Handle list of content blocks
                         if isinstance(raw_content, list):
-                            text_parts = []
-                            for part in raw_content:
-                                if (
-                                    isinstance(part, dict)
-                                    and part.get("type") == "text"
-                                ):
-                                    text_parts.append(part.get("text", ""))
-                                elif isinstance(part, str):
-                                    text_parts.append(part)
-                            raw_content = "\n".join(text_parts)
+                            raw_content = _blocks_text(raw_content, "\n")
 
                         # If content is still not a string, or is a JSON string, try to make it pretty
                         if not isinstance(raw_content, str):
                             try:
-                                display_content = json.dumps(raw_content, indent=2)
+                                display_content = orjson.dumps(
+                                    raw_content, option=orjson.OPT_INDENT_2
+                                ).decode()
                             except:
                                 display_content = str(raw_content)
                         else:
@@ -557,15 +621,17 @@ async def chat_endpoint(request: Request):
                                 ) or (
                                     stripped.startswith("[") and stripped.endswith("]")
                                 ):
-                                    parsed = json.loads(stripped)
-                                    display_content = json.dumps(parsed, indent=2)
+                                    parsed = orjson.loads(stripped)
+                                    display_content = orjson.dumps(
+                                        parsed, option=orjson.OPT_INDENT_2
+                                    ).decode()
                                     display_content = f"```json\n{display_content}\n```"
                                 else:
                                     display_content = raw_content
                             except:
                                 display_content = raw_content
 
-                        yield json.dumps(
+                        yield _dumps(
                             {
                                 "type": "tool_result",
                                 "tool": tool_name,
@@ -575,7 +641,9 @@ async def chat_endpoint(request: Request):
 
         except Exception as e:
             logger.error(f"Error in astream_events: {e}", exc_info=True)
-            yield json.dumps({"type": "error", "content": str(e)}) + "\n"
+            yield _dumps({"type": "error", "content": str(e)}) + "\n"
+        finally:
+            agent_manager.end_thread_run(thread_id)
 
     return StreamingResponse(
         event_generator(),
@@ -1,26 +1,147 @@
+import asyncio
+import httpx
 import requests
 import json
-from langchain_core.tools import tool
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.tools import StructuredTool, tool
 from pytrends.request import TrendReq
 from typing import List, Dict, Union
 
-@tool
-def get_autocomplete_suggestions(query: str) -> List[str]:
+# Successful lookups are reused for this long; the same keywords come up
+# again and again across sessions and feedback rounds
+_CACHE_TTL = 15 * 60
+_CACHE_SIZE = 512
+_cache: Dict[tuple, tuple] = {}
+# Sync tools run in worker threads
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key: tuple):
+    entry = _cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def _cache_put(key: tuple, value):
+    with _cache_lock:
+        if len(_cache) >= _CACHE_SIZE:
+            # Drop expired entries first, then the oldest ones
+            now = time.monotonic()
+            for k in [k for k, (t, _) in _cache.items() if now - t >= _CACHE_TTL]:
+                del _cache[k]
+            if len(_cache) >= _CACHE_SIZE:
+                del _cache[next(iter(_cache))]
+        _cache[key] = (time.monotonic(), value)
+
+
+# Seed queries fetched at once by one autocomplete call
+_AUTOCOMPLETE_MAX_SEEDS = 10
+# Called directly: google.com only answers with a redirect to this host
+_AUTOCOMPLETE_URL = "https://www.google.com/complete/search"
+_http_client: httpx.AsyncClient | None = None
+
+
+def _cached_suggestions(query: str) -> tuple[tuple, List[str] | None]:
+    key = ("autocomplete", query.strip().lower())
+    return key, _cache_get(key)
+
+
+def _parse_suggestions(key: tuple, response) -> List[str]:
+    """Suggestions from a requests or httpx response (cached when it succeeded)."""
+    if response.status_code != 200:
+        return []
+    data = response.json()
+    # data[1] contains the list of suggestions
+    suggestions = data[1] if len(data) >= 2 else []
+    _cache_put(key, suggestions)
+    return suggestions
+
+
+def _fetch_suggestions(query: str) -> List[str]:
+    key, cached = _cached_suggestions(query)
+    if cached is not None:
+        return cached
+
+    try:
+        response = requests.get(
+            _AUTOCOMPLETE_URL, params={"client": "chrome", "q": query}, timeout=5
+        )
+        return _parse_suggestions(key, response)
+    except Exception as e:
+        return [f"Error fetching suggestions: {str(e)}"]
+
+
+def _async_client() -> httpx.AsyncClient:
+    """Shared client, so concurrent lookups reuse pooled connections."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=5, follow_redirects=True)
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared async HTTP client (on shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def _afetch_suggestions(query: str) -> List[str]:
+    key, cached = _cached_suggestions(query)
+    if cached is not None:
+        return cached
+
+    try:
+        response = await _async_client().get(
+            _AUTOCOMPLETE_URL, params={"client": "chrome", "q": query}
+        )
+        return _parse_suggestions(key, response)
+    except Exception as e:
+        return [f"Error fetching suggestions: {str(e)}"]
+
+
+def _get_autocomplete_suggestions(
+    query: Union[str, List[str]],
+) -> Union[List[str], Dict[str, List[str]]]:
     """
     Get Search Autocomplete Suggestions for a given query to find high-intent long-tail keywords.
     Useful for discovering what users are actually typing into the search bar.
+    Pass a list of seed queries (max 10) to expand them all in one call; the result
+    then maps each seed to its suggestions.
     """
-    url = f"http://google.com/complete/search?client=chrome&q={query}"
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if len(data) >= 2:
-                # data[1] contains the list of suggestions
-                return data[1]
-        return []
-    except Exception as e:
-        return [f"Error fetching suggestions: {str(e)}"]
+    if isinstance(query, str):
+        return _fetch_suggestions(query)
+
+    seeds = list(dict.fromkeys(query))[:_AUTOCOMPLETE_MAX_SEEDS]
+    if not seeds:
+        return {}
+    # Each lookup is a blocking HTTP round-trip; fetch the seeds side by side
+    with ThreadPoolExecutor(max_workers=len(seeds)) as pool:
+        return dict(zip(seeds, pool.map(_fetch_suggestions, seeds)))
+
+
+async def _aget_autocomplete_suggestions(
+    query: Union[str, List[str]],
+) -> Union[List[str], Dict[str, List[str]]]:
+    if isinstance(query, str):
+        return await _afetch_suggestions(query)
+
+    seeds = list(dict.fromkeys(query))[:_AUTOCOMPLETE_MAX_SEEDS]
+    results = await asyncio.gather(*(_afetch_suggestions(seed) for seed in seeds))
+    return dict(zip(seeds, results))
+
+
+# Agents run tools via ainvoke, so the coroutine keeps lookups on the event loop
+# instead of tying up an executor thread per request
+get_autocomplete_suggestions = StructuredTool.from_function(
+    func=_get_autocomplete_suggestions,
+    coroutine=_aget_autocomplete_suggestions,
+    name="get_autocomplete_suggestions",
+)
 
 @tool
 def get_google_trends(keywords: List[str]) -> Dict[str, str]:
@@ -29,10 +150,15 @@ def get_google_trends(keywords: List[str]) -> Dict[str, str]:
     Returns a textual summary of the trend direction (Rising/Falling/Stable) and the peak value.
     This is useful for validating market interest and seasonality.
     """
+    # Pytrends allows max 5 keywords
+    kw_list = keywords[:5]
+    key = ("trends", tuple(kw_list))
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
     try:
         pytrends = TrendReq(hl='en-US', tz=360)
-        # Pytrends allows max 5 keywords
-        kw_list = keywords[:5]
         
         pytrends.build_payload(kw_list, cat=0, timeframe='today 12-m', geo='', gprop='')
         
@@ -60,6 +186,7 @@ def get_google_trends(keywords: List[str]) -> Dict[str, str]:
                 
                 summary[kw] = f"Trend: {trend_direction} (Avg Interest: {mean_val:.1f}, Peak: {max_val})"
         
+        _cache_put(key, summary)
         return summary
     except Exception as e:
         return {"error": f"Failed to fetch trends: {str(e)}"}
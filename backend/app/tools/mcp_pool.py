@@ -0,0 +1,297 @@
+"""
+MCP Session Pool - persistent, reusable MCP client sessions.
+
+A single MCP session serializes every tool call through one connection.
+The pool keeps several long-lived sessions per server open so concurrent
+graphs can call tools without waiting on each other.
+
+The pool exposes the subset of the ``ClientSession`` interface used by
+``load_mcp_tools`` (``list_tools`` / ``call_tool``), so it can be passed
+in place of a session; every call borrows a pooled session for its duration.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+import anyio
+import orjson
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+# Errors that mean the underlying transport is gone and the session must be replaced
+_BROKEN_SESSION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+
+def default_pool_size() -> int:
+    """Number of sessions to keep per server."""
+    return min(os.cpu_count() or 1, 4)
+
+
+class _PooledSession:
+    """
+    A session kept open by a dedicated holder task.
+
+    MCP sessions are anyio-backed context managers and must be entered and
+    exited from the same task, so each one lives inside its own task until
+    it is asked to close.
+    """
+
+    def __init__(self, session: ClientSession, closing: asyncio.Event, task: asyncio.Task):
+        self.session = session
+        self.closing = closing
+        self.task = task
+        self.last_used = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return not self.task.done()
+
+    async def close(self):
+        self.closing.set()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """
+    Pool of persistent sessions to a single MCP server.
+
+    Attributes:
+        server_name: Name of the server in the MultiServerMCPClient config
+        size: Maximum number of open sessions
+        idle_ttl: Seconds an idle session is kept open (at least one is always kept)
+        result_ttl: Seconds a successful call_tool result is reused for identical
+            (tool, arguments) calls; 0 disables the result cache
+        result_cache_size: Maximum number of cached results
+    """
+
+    def __init__(
+        self,
+        client: MultiServerMCPClient,
+        server_name: str,
+        size: int | None = None,
+        idle_ttl: float = 300.0,
+        result_ttl: float = 0.0,
+        result_cache_size: int = 512,
+    ):
+        self.client = client
+        self.server_name = server_name
+        self.size = size or default_pool_size()
+        self.idle_ttl = idle_ttl
+        self._idle: deque[_PooledSession] = deque()
+        self._sessions: set[_PooledSession] = set()
+        self._opening = 0
+        # Checkouts waiting for a session to come back or for capacity to free up
+        self._waiters: deque[asyncio.Future] = deque()
+        self._closed = False
+        self._reaper: asyncio.Task | None = None
+        self.result_ttl = result_ttl
+        self.result_cache_size = result_cache_size
+        # (tool name, canonical arguments) -> (stored at, CallToolResult), least recently used first
+        self._results: OrderedDict[tuple[str, bytes], tuple[float, object]] = OrderedDict()
+        # (tool name, canonical arguments) -> request currently running for it
+        self._inflight: dict[tuple[str, bytes], asyncio.Task] = {}
+
+    async def start(self):
+        """Pre-warm the pool and start the idle reaper."""
+        self._opening += self.size
+        try:
+            opened = await asyncio.gather(
+                *(self._open() for _ in range(self.size)), return_exceptions=True
+            )
+        finally:
+            self._opening -= self.size
+
+        sessions = [s for s in opened if isinstance(s, _PooledSession)]
+        if not sessions:
+            raise opened[0]
+        self._idle.extend(sessions)
+
+        self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def _open(self) -> _PooledSession:
+        """Open a new session inside its own holder task."""
+        ready = asyncio.get_running_loop().create_future()
+        closing = asyncio.Event()
+
+        async def hold():
+            try:
+                async with self.client.session(self.server_name) as session:
+                    ready.set_result(session)
+                    await closing.wait()
+            except BaseException as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                    return
+                raise
+
+        task = asyncio.create_task(hold())
+        try:
+            session = await ready
+        except BaseException:
+            # Cancelled while connecting: don't leave the holder (and its session) behind
+            ready.cancel()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise
+        pooled = _PooledSession(session, closing, task)
+        self._sessions.add(pooled)
+        return pooled
+
+    async def _discard(self, pooled: _PooledSession):
+        self._sessions.discard(pooled)
+        # Capacity freed: a waiting checkout can open a replacement
+        self._wake_one()
+        await pooled.close()
+
+    def _wake_one(self):
+        """Let one waiting checkout re-check the pool."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def _checkout(self) -> _PooledSession:
+        while True:
+            if self._closed:
+                raise RuntimeError("MCP session pool is closed")
+            if self._idle:
+                pooled = self._idle.popleft()
+            elif len(self._sessions) + self._opening < self.size:
+                self._opening += 1
+                try:
+                    pooled = await self._open()
+                except BaseException:
+                    self._opening -= 1
+                    # The reserved slot is free again
+                    self._wake_one()
+                    raise
+                self._opening -= 1
+                return pooled
+            else:
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    # Woken but cancelled before acting on it: pass the wake-up on
+                    if waiter.done() and not waiter.cancelled():
+                        self._wake_one()
+                    raise
+                continue
+
+            # Health check: the holder task exits when the transport dies
+            if pooled.alive:
+                return pooled
+            await self._discard(pooled)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a session for the duration of the context."""
+        pooled = await self._checkout()
+        try:
+            yield pooled.session
+        except McpError as e:
+            if e.error.code == CONNECTION_CLOSED:
+                await self._discard(pooled)
+                pooled = None
+            raise
+        except _BROKEN_SESSION_ERRORS:
+            await self._discard(pooled)
+            pooled = None
+            raise
+        finally:
+            if pooled is not None:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+                self._wake_one()
+
+    async def list_tools(self, *args, **kwargs):
+        async with self.acquire() as session:
+            return await session.list_tools(*args, **kwargs)
+
+    async def call_tool(self, name: str, arguments: dict | None = None, *args, **kwargs):
+        # Calls with extra options (timeouts, progress callbacks) are never shared
+        key = None if args or any(kwargs.values()) else self._call_key(name, arguments)
+        if key is None:
+            return await self._call_tool(None, name, arguments, *args, **kwargs)
+
+        if self.result_ttl > 0:
+            entry = self._results.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.result_ttl:
+                self._results.move_to_end(key)
+                return entry[1]
+
+        # Identical calls already in flight share one request. The request runs
+        # in its own task, so a cancelled caller doesn't cancel it for the rest.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._call_tool(key, name, arguments))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_call(key, t))
+        return await asyncio.shield(task)
+
+    async def _call_tool(self, key, name: str, arguments: dict | None, *args, **kwargs):
+        async with self.acquire() as session:
+            result = await session.call_tool(name, arguments, *args, **kwargs)
+
+        if key is not None and self.result_ttl > 0 and not result.isError:
+            self._results[key] = (time.monotonic(), result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+        return result
+
+    def _finish_call(self, key: tuple[str, bytes], task: asyncio.Task):
+        self._inflight.pop(key, None)
+        # Mark the error as seen even if every caller gave up waiting
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    def _call_key(name: str, arguments: dict | None) -> tuple[str, bytes] | None:
+        """Identity of a call (tool + canonical arguments), or None if not serializable."""
+        try:
+            return name, orjson.dumps(arguments or {}, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return None
+
+    async def _reap_idle(self):
+        """Close sessions that have been idle longer than idle_ttl."""
+        while True:
+            await asyncio.sleep(self.idle_ttl / 2)
+            now = time.monotonic()
+            # The first idle session is always kept
+            expired = [
+                pooled
+                for pooled in list(self._idle)[1:]
+                if now - pooled.last_used > self.idle_ttl
+            ]
+            for pooled in expired:
+                self._idle.remove(pooled)
+            for pooled in expired:
+                await self._discard(pooled)
+
+    async def close(self):
+        """Close every session in the pool."""
+        self._closed = True
+        # Waiting checkouts fail fast instead of waiting on a pool that won't refill
+        while self._waiters:
+            self._wake_one()
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        # Teardown is I/O-bound; close all sessions concurrently. Each close
+        # swallows its own errors, so one bad session can't block the rest.
+        async with asyncio.TaskGroup() as tg:
+            for pooled in list(self._sessions):
+                tg.create_task(self._discard(pooled))
@@ -1,18 +1,26 @@
 import uvicorn
 import os
-from dotenv import load_dotenv
 
-# Load env variables
-load_dotenv()
+# Importing the app package loads env variables (once for the process)
+import app  # noqa: F401
 
 PORT = int(os.getenv("PORT", 8000))
 
+# The server is I/O-bound (LLM + MCP calls); prefer libuv's event loop when installed
+try:
+    import uvloop  # noqa: F401
+
+    LOOP = "uvloop"
+except ImportError:
+    LOOP = "asyncio"
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.server:app",
         host="0.0.0.0",
         port=PORT,
         reload=False,
+        loop=LOOP,
         log_level="info",
         access_log=True,
     )
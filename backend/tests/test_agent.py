@@ -0,0 +1,99 @@
+"""Tests for AgentManager bookkeeping that needs no model or network."""
+
+import asyncio
+import logging
+
+from langchain_core.runnables import ConfigurableField
+from langchain_openai import ChatOpenAI
+
+from app import agent
+from app.agent import AgentManager
+from app.brew.state import TaskAssignment, TaskPlan, WorkerReport
+
+
+def test_threads_with_a_run_in_progress_are_not_evicted(monkeypatch):
+    monkeypatch.setattr(agent, "CHECKPOINT_DB", "")
+    monkeypatch.setattr(agent, "THREAD_IDLE_TTL", -1)
+    manager = AgentManager()
+    manager.begin_thread_run("busy")
+    manager.begin_thread_run("busy")
+    manager.touch_thread("idle")
+    assert manager._evict_idle() == ["idle"]
+
+    # Still one run streaming on the thread
+    manager.end_thread_run("busy")
+    assert manager._evict_idle() == []
+
+    manager.end_thread_run("busy")
+    assert not manager._thread_runs
+    assert manager._evict_idle() == ["busy"]
+
+
+def test_checkpoints_load_brew_state_types_without_warnings(caplog):
+    serde = agent._checkpoint_serde()
+    plan = TaskPlan(reasoning="r", tasks=[TaskAssignment(worker="content", task="write", id="t1")])
+    reports = [WorkerReport(worker="research", task="find", result="found")]
+    with caplog.at_level(logging.WARNING):
+        loaded = serde.loads_typed(serde.dumps_typed({"task_plan": plan, "worker_reports": reports}))
+    assert loaded == {"task_plan": plan, "worker_reports": reports}
+    assert not caplog.records
+
+
+def configurable_model():
+    return agent._CachedConfigurableFields(
+        default=ChatOpenAI(model="gpt-4.1", api_key="sk-test"),
+        fields={"model_name": ConfigurableField(id="model_name")},
+    )
+
+
+def configured(wrapper, model_name):
+    return wrapper.prepare({"configurable": {"model_name": model_name}})[0]
+
+
+def test_configured_models_are_cached_per_wrapper(monkeypatch):
+    monkeypatch.setattr(agent, "_CONFIGURED_MODELS_SIZE", 2)
+    wrapper = configurable_model()
+    mini = configured(wrapper, "gpt-4.1-mini")
+    assert mini.model_name == "gpt-4.1-mini"
+    assert configured(wrapper, "gpt-4.1-mini") is mini
+    # with_config copies share the cache; other wrappers have their own
+    assert configured(wrapper.with_config(tags=["x"]), "gpt-4.1-mini") is mini
+    assert configured(configurable_model(), "gpt-4.1-mini") is not mini
+
+    # Least recently used configurations are evicted first
+    nano = configured(wrapper, "gpt-4.1-nano")
+    configured(wrapper, "gpt-4.1-mini")
+    configured(wrapper, "gpt-5")
+    assert configured(wrapper, "gpt-4.1-mini") is mini
+    assert configured(wrapper, "gpt-4.1-nano") is not nano
+
+
+def test_get_agent_reconnects_after_disconnect():
+    class FakePool:
+        async def close(self):
+            pass
+
+    async def main():
+        manager = AgentManager()
+        manager.model = object()
+        connects = []
+
+        async def fake_initialize_tools():
+            connects.append(1)
+            manager.pool = FakePool()
+            manager.tools = ["tavily_search"]
+
+        async def fake_build_mode(name):
+            return (name, list(manager.tools))
+
+        manager._initialize_tools = fake_initialize_tools
+        manager._build_mode = fake_build_mode
+        await manager.connect()
+        assert await manager.get_agent("search") == ("search", ["tavily_search"])
+
+        await manager.disconnect()
+        assert manager.tools == []
+        assert await manager.get_agent("search") == ("search", ["tavily_search"])
+        assert len(connects) == 2
+
+    asyncio.run(asyncio.wait_for(main(), timeout=5))
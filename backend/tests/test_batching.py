@@ -0,0 +1,76 @@
+"""Tests for BatchedPlanner micro-batching."""
+
+import asyncio
+
+from langchain_core.runnables import RunnableLambda
+
+from app.brew.batching import BatchedPlanner
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def make_planner(delay: float = 0.0, **kwargs):
+    batches = []
+
+    async def handle(x):
+        await asyncio.sleep(delay)
+        if x == "fail":
+            raise ValueError("bad input")
+        return x * 2
+
+    runnable = RunnableLambda(handle)
+    abatch = runnable.abatch
+
+    async def recording_abatch(inputs, *args, **kw):
+        batches.append(list(inputs))
+        return await abatch(inputs, *args, **kw)
+
+    object.__setattr__(runnable, "abatch", recording_abatch)
+    return BatchedPlanner(runnable, **kwargs), batches
+
+
+def test_concurrent_calls_share_one_batch():
+    async def main():
+        planner, batches = make_planner(window_ms=10)
+        results = await asyncio.gather(*(planner.submit(i) for i in range(4)))
+        assert results == [0, 2, 4, 6]
+        assert batches == [[0, 1, 2, 3]]
+        assert not planner._running
+
+    run(main())
+
+
+def test_full_batch_flushes_without_waiting():
+    async def main():
+        planner, batches = make_planner(window_ms=10_000, max_batch=2)
+        assert await asyncio.gather(planner.submit(1), planner.submit(2)) == [2, 4]
+        assert batches == [[1, 2]]
+
+    run(main())
+
+
+def test_errors_only_reach_their_own_caller():
+    async def main():
+        planner, _ = make_planner(window_ms=10)
+        ok, failed = await asyncio.gather(
+            planner.submit(3), planner.submit("fail"), return_exceptions=True
+        )
+        assert ok == 6
+        assert isinstance(failed, ValueError)
+
+    run(main())
+
+
+def test_running_batches_are_referenced_until_done():
+    async def main():
+        planner, _ = make_planner(delay=0.05, window_ms=0)
+        pending = asyncio.ensure_future(planner.submit(5))
+        await asyncio.sleep(0.01)
+        assert planner._running
+        assert await pending == 10
+        await asyncio.sleep(0)
+        assert not planner._running
+
+    run(main())
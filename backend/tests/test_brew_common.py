@@ -0,0 +1,123 @@
+"""Tests for the brew planner helpers and plan parsing."""
+
+import pytest
+
+from app.brew.common import (
+    classify_request,
+    dedupe_sources,
+    extract_sources,
+    format_context,
+    link_tasks,
+    normalize_url,
+)
+from app.brew.state import TaskAssignment, TaskPlan, WorkerReport
+
+
+def task(worker="content", id="", depends_on=()):
+    return TaskAssignment(worker=worker, task=f"{worker} {id}", id=id, depends_on=list(depends_on))
+
+
+def test_link_tasks_gives_every_task_a_unique_id():
+    tasks = link_tasks([task(id="a"), task(id="a"), task(id="")])
+    assert [t.id for t in tasks] == ["a", "t2", "t3"]
+
+
+def test_link_tasks_drops_unknown_and_self_dependencies():
+    tasks = link_tasks([task(id="a", depends_on=["a", "b"]), task(id="b", depends_on=["a", "zzz"])])
+    assert tasks[0].depends_on == ["b"]
+    assert tasks[1].depends_on == ["a"]
+
+
+@pytest.mark.parametrize(
+    "text, route",
+    [
+        ("hi", "direct"),
+        ("Thanks!", "direct"),
+        ("LGTM", "direct"),
+        ("", "direct"),
+        ("   ", "direct"),
+        ("who are you", "direct"),
+        ("What is a marketing funnel?", "general"),
+        ("xylophone tips", "general"),
+        ("Research the latest AI trends", "plan"),
+        ("share this on X", "plan"),
+        ("ok thanks, now research our competitors", "plan"),
+        (" ".join(["word"] * 30), "plan"),
+        ("hi there, can you explain what a marketing funnel is and how the top stage works", "general"),
+    ],
+)
+def test_classify_request(text, route):
+    assert classify_request(text) == route
+
+
+def test_long_messages_route_like_short_ones():
+    # Messages past the memoization cutoff take the uncached path
+    text = "please research " + "competitor pricing pages " * 10
+    assert len(text) > 64
+    assert classify_request(text) == "plan"
+
+
+def test_task_plan_from_tool_args_skips_invalid_tasks():
+    plan = TaskPlan.from_tool_args(
+        {
+            "reasoning": "because",
+            "tasks": [
+                {"worker": "research", "task": "find data", "id": "r1", "priority": 9},
+                {"worker": "content", "task": "write", "depends_on": ["r1"], "priority": "x"},
+                {"worker": "nobody", "task": "ignored"},
+                {"worker": "social", "task": ""},
+                "not a task",
+            ],
+        }
+    )
+    assert plan.reasoning == "because"
+    assert [(t.worker, t.id, t.priority) for t in plan.tasks] == [
+        ("research", "r1", 3),
+        ("content", "", 2),
+    ]
+    assert plan.tasks[1].depends_on == ["r1"]
+
+
+def test_task_plan_from_empty_args():
+    plan = TaskPlan.from_tool_args({"tasks": None})
+    assert plan.reasoning == ""
+    assert plan.tasks == []
+
+
+def test_format_context_drops_repeated_paragraphs():
+    reports = [
+        WorkerReport(worker="research", task="r", result="Fact one.\n\nFact two."),
+        WorkerReport(worker="reviewer", task="v", result="fact   ONE.\n\nVerdict."),
+        WorkerReport(worker="analytics", task="a", result="Fact two."),
+    ]
+    assert format_context(reports, 1000) == (
+        "## research\nFact one.\n\nFact two.\n\n## reviewer\nVerdict."
+    )
+
+
+def test_format_context_stays_within_budget():
+    reports = [
+        WorkerReport(worker="research", task="r", result="x" * 500),
+        WorkerReport(worker="content", task="c", result="y" * 500),
+    ]
+    context = format_context(reports, 100)
+    assert len(context) <= 100
+    assert "## content" not in context
+
+
+def test_normalize_url_strips_tracking_and_fragment():
+    url = "HTTPS://Example.COM/Path/?utm_source=x&id=1&fbclid=z#frag"
+    assert normalize_url(url) == "https://example.com/Path?id=1"
+
+
+def test_extract_sources_trims_punctuation_and_dedupes():
+    text = "See https://a.com/x. and (https://a.com/x/) plus https://b.org/?ref=hn, ok"
+    assert extract_sources(text) == ["https://a.com/x", "https://b.org/"]
+
+
+def test_dedupe_sources_keeps_first_seen_order():
+    reports = [
+        WorkerReport(worker="research", task="r", sources=["https://b.org/", "https://a.com/x"]),
+        WorkerReport(worker="analytics", task="a", sources=["https://a.com/x", "https://c.net/"]),
+    ]
+    assert dedupe_sources(reports) == ["https://b.org/", "https://a.com/x", "https://c.net/"]
@@ -0,0 +1,180 @@
+"""Tests for the brew executor's scheduling and the worker/graph caches."""
+
+import asyncio
+
+import pytest
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from app.brew import graph
+from app.brew.graph import _BrewContext, _run_worker, create_brew_graph, executor
+from app.brew.state import TaskAssignment, TaskPlan, WorkerReport
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def plan(*tasks):
+    return TaskPlan(
+        tasks=[
+            TaskAssignment(worker=worker, task=f"{worker} task {id}", id=id, depends_on=deps)
+            for worker, id, deps in tasks
+        ]
+    )
+
+
+def sent(command):
+    return [(s.node, s.arg["assignment"].id) for s in command.goto]
+
+
+def test_executor_dispatches_every_ready_task():
+    state = {
+        "task_plan": plan(("research", "t1", []), ("content", "t2", ["t1"]), ("social", "t3", [])),
+    }
+    command = executor(state)
+    assert sent(command) == [("research_worker", "t1"), ("social_worker", "t3")]
+    assert command.update == {"dispatched_tasks": ["t1", "t3"]}
+
+
+def test_executor_passes_dependency_results_as_context():
+    task_plan = plan(("research", "t1", []), ("content", "t2", ["t1"]), ("social", "t3", []))
+    state = {
+        "task_plan": task_plan,
+        "dispatched_tasks": ["t1", "t3"],
+        "completed_tasks": ["t1"],
+        "worker_reports": [
+            WorkerReport(worker="strategist", task=task_plan.tasks[0].task, result="Findings.")
+        ],
+    }
+    command = executor(state)
+    assert sent(command) == [("content_worker", "t2")]
+    assert command.goto[0].arg["context"] == "## strategist\nFindings."
+
+
+def test_executor_runs_one_research_chain_at_a_time():
+    task_plan = plan(("research", "t1", []), ("research", "t2", []))
+    command = executor({"task_plan": task_plan})
+    assert sent(command) == [("research_worker", "t1")]
+
+    command = executor({"task_plan": task_plan, "dispatched_tasks": ["t1"]})
+    assert command.goto == []
+
+    command = executor(
+        {"task_plan": task_plan, "dispatched_tasks": ["t1"], "completed_tasks": ["t1"]}
+    )
+    assert sent(command) == [("research_worker", "t2")]
+
+
+def test_executor_waits_for_in_flight_tasks_then_synthesizes():
+    task_plan = plan(("content", "t1", []), ("social", "t2", []))
+    state = {"task_plan": task_plan, "dispatched_tasks": ["t1", "t2"], "completed_tasks": ["t1"]}
+    assert executor(state).goto == []
+
+    state["completed_tasks"] = ["t1", "t2"]
+    assert executor(state).goto == "synthesizer"
+    assert executor({}).goto == "synthesizer"
+
+
+def test_executor_breaks_dependency_cycles():
+    task_plan = plan(("content", "t1", ["t2"]), ("social", "t2", ["t1"]), ("report", "t3", []))
+    # A task is still running, so the cycle may yet resolve: wait for it
+    state = {"task_plan": task_plan, "dispatched_tasks": ["t3"]}
+    assert executor(state).goto == []
+
+    # Nothing is in flight and nothing is ready: run what's left rather than stall
+    state["completed_tasks"] = ["t3"]
+    assert sent(executor(state)) == [("content_worker", "t1"), ("social_worker", "t2")]
+
+
+class FakeAgent:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, state):
+        self.calls += 1
+        text = state["messages"][0]["content"]
+        return {"messages": [AIMessage(content=f"done: {text} https://example.com/a")]}
+
+
+def make_context(agent):
+    return _BrewContext(
+        model=None,
+        planner_model=None,
+        batched_planner=None,
+        tools_key="tavily_search",
+        agents={"content": agent},
+    )
+
+
+@pytest.fixture
+def llm_cache():
+    graph._worker_cache.clear()
+    set_llm_cache(InMemoryCache())
+    yield
+    set_llm_cache(None)
+    graph._worker_cache.clear()
+
+
+def test_worker_cache_reuses_identical_tasks(llm_cache):
+    async def main():
+        agent = FakeAgent()
+        ctx = make_context(agent)
+        state = {"assignment": TaskAssignment(worker="content", task="write", id="t1")}
+        first = await _run_worker(ctx, state, "content")
+        second = await _run_worker(ctx, state, "content")
+        assert agent.calls == 1
+        assert second == first
+        assert second["worker_reports"][0].sources == ["https://example.com/a"]
+        assert second["completed_tasks"] == ["t1"]
+
+        # Different context means a different task
+        await _run_worker(ctx, {**state, "context": "## research\nFacts."}, "content")
+        assert agent.calls == 2
+
+    run(main())
+
+
+def test_speculative_runs_bypass_the_worker_cache(llm_cache):
+    async def main():
+        agent = FakeAgent()
+        ctx = make_context(agent)
+        state = {"assignment": TaskAssignment(worker="content", task="write", id="t1")}
+        await _run_worker(ctx, state, "content", speculative=True)
+        assert not graph._worker_cache
+        await _run_worker(ctx, state, "content")
+        await _run_worker(ctx, state, "content", speculative=True)
+        assert agent.calls == 3
+
+    run(main())
+
+
+def test_worker_cache_is_off_without_an_llm_cache():
+    async def main():
+        agent = FakeAgent()
+        ctx = make_context(agent)
+        state = {"assignment": TaskAssignment(worker="content", task="write", id="t1")}
+        await _run_worker(ctx, state, "content")
+        await _run_worker(ctx, state, "content")
+        assert agent.calls == 2
+
+    graph._worker_cache.clear()
+    run(main())
+    assert not graph._worker_cache
+
+
+class FakeModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def test_graph_cache_reuses_compiled_graph_per_model():
+    graph._GRAPH_CACHE.clear()
+    model = FakeModel(messages=iter([]))
+    first = create_brew_graph(model, [])
+    assert create_brew_graph(model, []) is first
+    assert create_brew_graph(FakeModel(messages=iter([])), []) is not first
+    assert len(graph._GRAPH_CACHE) == 2
+    graph._GRAPH_CACHE.clear()
@@ -0,0 +1,65 @@
+"""Tests for the autocomplete tool's async path (no network)."""
+
+import asyncio
+
+import httpx
+
+from app.tools import marketing
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def use_transport(handler):
+    marketing._cache.clear()
+    marketing._http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), follow_redirects=True
+    )
+
+
+def test_async_suggestions_are_fetched_and_cached():
+    urls = []
+
+    def handler(request):
+        urls.append(request.url)
+        if request.url.host != "www.google.com":
+            # google.com redirects here; a non-200 answer yields no suggestions
+            return httpx.Response(301, headers={"location": "https://www.google.com/"})
+        query = request.url.params["q"]
+        return httpx.Response(200, json=[query, [f"{query} tips", f"{query} ideas"]])
+
+    async def main():
+        use_transport(handler)
+        try:
+            assert await marketing._afetch_suggestions("seo") == ["seo tips", "seo ideas"]
+            assert await marketing._afetch_suggestions(" SEO ") == ["seo tips", "seo ideas"]
+            assert [u.host for u in urls] == ["www.google.com"]
+            # The sync path reads the same cache
+            assert marketing._fetch_suggestions("seo") == ["seo tips", "seo ideas"]
+        finally:
+            await marketing.close_http_client()
+
+    run(main())
+
+
+def test_async_suggestions_failures_are_not_cached():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    async def main():
+        use_transport(handler)
+        try:
+            assert await marketing._aget_autocomplete_suggestions(["a", "b", "a"]) == {
+                "a": [],
+                "b": [],
+            }
+            assert await marketing._afetch_suggestions("a") == []
+            assert len(calls) == 3
+        finally:
+            await marketing.close_http_client()
+
+    run(main())
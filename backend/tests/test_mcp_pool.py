@@ -0,0 +1,311 @@
+"""Tests for MCPSessionPool against a fake MCP client (no network)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+from mcp.types import CallToolResult, TextContent
+
+from app.tools.mcp_pool import MCPSessionPool
+
+
+class FakeSession:
+    def __init__(self, client: "FakeClient"):
+        self.client = client
+
+    async def list_tools(self):
+        return ["tavily_search"]
+
+    async def call_tool(self, name, arguments=None, *args, **kwargs):
+        self.client.calls.append((name, arguments))
+        await asyncio.sleep(self.client.delay)
+        if name == "boom":
+            raise RuntimeError("tool failed")
+        return CallToolResult(
+            content=[TextContent(type="text", text=name)], isError=name == "bad"
+        )
+
+
+class FakeClient:
+    """Stands in for MultiServerMCPClient; counts opened and closed sessions."""
+
+    def __init__(self, delay: float = 0.0, fail_opens: int = 0, open_delay: float = 0.0):
+        self.delay = delay
+        self.open_delay = open_delay
+        self.fail_opens = fail_opens
+        self.opened = 0
+        self.closed = 0
+        self.calls = []
+
+    @asynccontextmanager
+    async def session(self, server_name):
+        if self.fail_opens:
+            self.fail_opens -= 1
+            raise ConnectionError("server unavailable")
+        await asyncio.sleep(self.open_delay)
+        self.opened += 1
+        try:
+            yield FakeSession(self)
+        finally:
+            self.closed += 1
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def test_start_prewarms_and_close_closes_everything():
+    async def main():
+        client = FakeClient()
+        pool = MCPSessionPool(client, "tavily", size=3)
+        await pool.start()
+        assert client.opened == 3
+        assert len(pool._idle) == 3
+        await pool.close()
+        assert client.closed == 3
+        assert not pool._sessions
+
+    run(main())
+
+
+def test_start_fails_when_no_session_opens():
+    async def main():
+        pool = MCPSessionPool(FakeClient(fail_opens=2), "tavily", size=2)
+        with pytest.raises(ConnectionError):
+            await pool.start()
+
+    run(main())
+
+
+def test_cancelled_open_does_not_leak_the_session():
+    async def main():
+        client = FakeClient(open_delay=0.05)
+        pool = MCPSessionPool(client, "tavily", size=1)
+        opening = asyncio.create_task(pool._open())
+        await asyncio.sleep(0.01)
+        opening.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await opening
+        await asyncio.sleep(0.1)
+        assert client.opened == 0
+        assert not pool._sessions
+        assert not [t for t in asyncio.all_tasks() if t.get_coro().__name__ == "hold"]
+
+    run(main())
+
+
+def test_checkout_reuses_idle_sessions():
+    async def main():
+        client = FakeClient()
+        pool = MCPSessionPool(client, "tavily", size=2)
+        await pool.start()
+        for _ in range(5):
+            assert await pool.list_tools() == ["tavily_search"]
+        assert client.opened == 2
+        await pool.close()
+
+    run(main())
+
+
+def test_dead_idle_session_is_replaced():
+    async def main():
+        client = FakeClient()
+        pool = MCPSessionPool(client, "tavily", size=1)
+        await pool.start()
+        dead = pool._idle[0]
+        # The holder task exits when the transport dies
+        await dead.close()
+        async with pool.acquire() as session:
+            assert session is not dead.session
+        assert client.opened == 2
+        assert dead not in pool._sessions
+        await pool.close()
+
+    run(main())
+
+
+def test_broken_session_is_discarded():
+    async def main():
+        client = FakeClient()
+        pool = MCPSessionPool(client, "tavily", size=2)
+        await pool.start()
+        with pytest.raises(anyio.ClosedResourceError):
+            async with pool.acquire():
+                raise anyio.ClosedResourceError
+        assert len(pool._sessions) == 1
+        assert len(pool._idle) == 1
+        await pool.close()
+
+    run(main())
+
+
+def test_waiter_opens_replacement_when_busy_session_breaks():
+    async def main():
+        client = FakeClient()
+        pool = MCPSessionPool(client, "tavily", size=1)
+        await pool.start()
+        holding = asyncio.Event()
+        release = asyncio.Event()
+
+        async def breaks():
+            async with pool.acquire():
+                holding.set()
+                await release.wait()
+                raise anyio.BrokenResourceError
+
+        async def waits():
+            async with pool.acquire() as session:
+                return session
+
+        breaker = asyncio.create_task(breaks())
+        await holding.wait()
+        waiter = asyncio.create_task(waits())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        release.set()
+        with pytest.raises(anyio.BrokenResourceError):
+            await breaker
+        assert await waiter is not None
+        assert client.opened == 2
+        await pool.close()
+
+    run(main())
+
+
+def test_waiter_wakes_when_session_is_returned():
+    async def main():
+        pool = MCPSessionPool(FakeClient(delay=0.05), "tavily", size=1)
+        await pool.start()
+        results = await asyncio.gather(*(pool.call_tool("search", {"q": i}) for i in range(4)))
+        assert [r.content[0].text for r in results] == ["search"] * 4
+        await pool.close()
+
+    run(main())
+
+
+def test_cancelled_waiter_passes_wake_up_on():
+    async def main():
+        client = FakeClient()
+        pool = MCPSessionPool(client, "tavily", size=1)
+        await pool.start()
+
+        async def use():
+            async with pool.acquire() as session:
+                return session
+
+        async with pool.acquire():
+            first = asyncio.create_task(use())
+            second = asyncio.create_task(use())
+            await asyncio.sleep(0.01)
+        # The session is back and `first` has been woken; cancel it before it runs
+        first.cancel()
+        assert await second is not None
+        await pool.close()
+
+    run(main())
+
+
+def test_close_fails_waiting_checkouts():
+    async def main():
+        pool = MCPSessionPool(FakeClient(), "tavily", size=1)
+        await pool.start()
+        async with pool.acquire():
+            waiter = asyncio.create_task(pool.list_tools())
+            await asyncio.sleep(0.01)
+            await pool.close()
+            with pytest.raises(RuntimeError):
+                await waiter
+
+    run(main())
+
+
+def test_reaper_closes_expired_idle_sessions_but_keeps_one():
+    async def main():
+        client = FakeClient()
+        pool = MCPSessionPool(client, "tavily", size=3, idle_ttl=0.05)
+        await pool.start()
+        await asyncio.sleep(0.15)
+        assert len(pool._sessions) == 1
+        assert client.closed == 2
+        await pool.close()
+
+    run(main())
+
+
+def test_identical_concurrent_calls_are_coalesced():
+    async def main():
+        client = FakeClient(delay=0.05)
+        pool = MCPSessionPool(client, "tavily", size=2)
+        await pool.start()
+        results = await asyncio.gather(
+            *(pool.call_tool("search", {"q": "a", "n": 1}) for _ in range(3)),
+            pool.call_tool("search", {"n": 1, "q": "a"}),
+            pool.call_tool("search", {"q": "b"}),
+        )
+        assert client.calls == [("search", {"q": "a", "n": 1}), ("search", {"q": "b"})]
+        assert len({id(r) for r in results[:4]}) == 1
+        assert not pool._inflight
+        await pool.close()
+
+    run(main())
+
+
+def test_coalesced_callers_share_errors():
+    async def main():
+        client = FakeClient(delay=0.05)
+        pool = MCPSessionPool(client, "tavily", size=1)
+        await pool.start()
+        results = await asyncio.gather(
+            pool.call_tool("boom", {}), pool.call_tool("boom", {}), return_exceptions=True
+        )
+        assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+        assert len(client.calls) == 1
+        await pool.close()
+
+    run(main())
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    async def main():
+        client = FakeClient(delay=0.05)
+        pool = MCPSessionPool(client, "tavily", size=1)
+        await pool.start()
+        first = asyncio.create_task(pool.call_tool("search", {"q": "a"}))
+        second = asyncio.create_task(pool.call_tool("search", {"q": "a"}))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert (await second).content[0].text == "search"
+        assert len(client.calls) == 1
+        await pool.close()
+
+    run(main())
+
+
+def test_result_cache_reuses_successful_results_only():
+    async def main():
+        client = FakeClient()
+        pool = MCPSessionPool(client, "tavily", size=1, result_ttl=60)
+        await pool.start()
+        await pool.call_tool("search", {"q": "a"})
+        await pool.call_tool("search", {"q": "a"})
+        await pool.call_tool("bad", {})
+        await pool.call_tool("bad", {})
+        assert client.calls == [("search", {"q": "a"}), ("bad", {}), ("bad", {})]
+        await pool.close()
+
+    run(main())
+
+
+def test_result_cache_is_off_by_default():
+    async def main():
+        client = FakeClient()
+        pool = MCPSessionPool(client, "tavily", size=1)
+        await pool.start()
+        await pool.call_tool("search", {"q": "a"})
+        await pool.call_tool("search", {"q": "a"})
+        assert len(client.calls) == 2
+        await pool.close()
+
+    run(main())
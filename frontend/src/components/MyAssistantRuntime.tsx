@@ -232,6 +232,21 @@ function InnerRuntimeProvider({
                     content: [{ type: "text", text: accumulatedContent + `\n\n---\n*${statusLine}*` }],
                   };
                   lastYieldTime = Date.now();
+                } else if (data.type === "worker_progress") {
+                  // Brew mode streaming progress of a running worker
+                  const emoji: Record<string, string> = {
+                    research: "🔍",
+                    content: "✍️",
+                    analytics: "📊",
+                    social: "📱",
+                    general: "💬",
+                  };
+                  const worker = data.worker || "worker";
+                  statusLine = `${emoji[worker] || "⏳"} ${worker} writing... (${data.chars} chars)`;
+                  yield {
+                    content: [{ type: "text", text: accumulatedContent + `\n\n---\n*${statusLine}*` }],
+                  };
+                  lastYieldTime = Date.now();
                 } else if (data.type === "worker_complete") {
                   // Brew mode worker completion - show as status
                   const emoji: Record<string, string> = {